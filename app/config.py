@@ -170,6 +170,7 @@ DEFAULT_PREFERENCES = {
     "font": DEFAULT_FONT,
     "font_size": DEFAULT_FONT_SIZE,
     "keyboard_font_size": 20,  # Default keyboard font size
+    "keyboard_backspace_debounce_ms": 0,  # Coalesce rapid on-screen Backspaces (0 = off)
     "window_size": DEFAULT_WINDOW_SIZE,
     "show_keyboard": True,
     "show_suggestions": True,
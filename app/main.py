@@ -373,6 +373,10 @@ class SinhalaWordApp(QMainWindow):
             self.keyboard_area = SinhalaKeyboard(parent=self, dark_mode=is_dark_mode)
             if hasattr(self.keyboard_area, 'keyPressed'):
                 self.keyboard_area.keyPressed.connect(self.on_keyboard_button_clicked)
+            if hasattr(self.keyboard_area, 'backspacePressed'):
+                self.keyboard_area.backspacePressed.connect(self.on_keyboard_backspace)
+                # Rapid Backspace presses are coalesced only if the user enabled it
+                self.keyboard_area.debounce_ms = int(self.preferences.get("keyboard_backspace_debounce_ms", 0) or 0)
 
             if hasattr(self.keyboard_area, 'height_for_font'):
                 keyboard_height = self.keyboard_area.height_for_font(keyboard_font_size)
@@ -640,6 +644,19 @@ class SinhalaWordApp(QMainWindow):
             # Clear state on error
             self.reset_input_state()
             
+    def on_keyboard_backspace(self, count):
+        """Handles a burst of on-screen Backspace presses coalesced by the keyboard."""
+        try:
+            # Delete all characters in one edit block so the editor updates once
+            cursor = self.editor.textCursor()
+            cursor.beginEditBlock()
+            for _ in range(count):
+                cursor.deletePreviousChar()
+            cursor.endEditBlock()
+            logger.debug(f"Keyboard input: {count} x 'Backspace'")
+        except Exception as e:
+            logger.error(f"Error in on_keyboard_backspace for count {count}: {e}")
+
     # Timer for debouncing keyboard resize events
     _keyboard_resize_timer = None
     _pending_keyboard_height = None
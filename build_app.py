@@ -17,6 +17,11 @@ def main():
     # Get the base directory
     base_dir = os.path.abspath(os.path.dirname(__file__))
     
+    # Bake toolbar icons into a compiled Qt resource module
+    bake_result = subprocess.run([sys.executable, os.path.join("tools", "bake_icons.py")], cwd=base_dir)
+    if bake_result.returncode != 0:
+        print("Warning: Icon baking failed. Icons will be rendered from SVG at runtime.")
+    
     # Run PyInstaller with our spec file
     # Try to find PyInstaller in the user's site-packages
     pyinstaller_path = os.path.join(os.path.expanduser("~"), "appdata", "local", "packages", 
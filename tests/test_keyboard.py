@@ -0,0 +1,36 @@
+"""
+Tests for the on-screen Sinhala keyboard.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def keyboard(app):
+    from ui.keyboard import SinhalaKeyboard
+    kb = SinhalaKeyboard()
+    kb.debounce_ms = 50
+    events = []
+    kb.keyPressed.connect(lambda key: events.append(("key", key)))
+    kb.backspacePressed.connect(lambda count: events.append(("bs", count)))
+    yield kb, events
+    kb.deleteLater()
+
+
+def test_debounced_backspace_is_delivered_before_the_next_key(keyboard):
+    kb, events = keyboard
+    kb._on_backspace()
+    kb._on_backspace()
+    kb.on_key_clicked("Space", None)
+    assert events == [("bs", 2), ("key", "Space")]
+    assert not kb._backspace_timer.isActive()
+
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Bake the toolbar icons into a compiled Qt resource module.
+
+Renders every icon in ICON_PATHS for each theme and standard size to PNG,
+writes a matching .qrc file and compiles it with pyside6-rcc into
+ui/icons_rc.py. When that module is present, ui.icons loads the prebaked
+pixmaps from ":/icons/{name}_{theme}_{size}.png" instead of parsing SVG.
+
+Usage:
+    python tools/bake_icons.py
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+
+# Allow running from any directory and without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, base_dir)
+
+from PySide6.QtGui import QGuiApplication
+
+from ui.icons import ICON_PATHS, THEME_COLORS, BAKED_ICON_SIZES, create_icon
+
+# Output locations
+ICONS_DIR = os.path.join(base_dir, "resources", "icons")
+QRC_PATH = os.path.join(ICONS_DIR, "icons.qrc")
+RC_MODULE_PATH = os.path.join(base_dir, "ui", "icons_rc.py")
+
+
+def bake_pngs():
+    """Render every (name, theme, size) combination to PNG and return the file names."""
+    os.makedirs(ICONS_DIR, exist_ok=True)
+    file_names = []
+    for icon_name in ICON_PATHS:
+        for theme, color in THEME_COLORS.items():
+            for size in BAKED_ICON_SIZES:
+                file_name = f"{icon_name}_{theme}_{size}.png"
+                pixmap = create_icon(icon_name, size=size, color=color).pixmap(size, size)
+                if not pixmap.save(os.path.join(ICONS_DIR, file_name), "PNG"):
+                    raise RuntimeError(f"Failed to write {file_name}")
+                file_names.append(file_name)
+    return file_names
+
+
+def write_qrc(file_names):
+    """Write the .qrc file listing the baked PNGs under the /icons prefix."""
+    with open(QRC_PATH, "w", encoding="utf-8") as f:
+        f.write('<!DOCTYPE RCC><RCC version="1.0">\n')
+        f.write('<qresource prefix="/icons">\n')
+        for file_name in file_names:
+            f.write(f'    <file>{file_name}</file>\n')
+        f.write('</qresource>\n')
+        f.write('</RCC>\n')
+
+
+def compile_qrc():
+    """Compile the .qrc file into ui/icons_rc.py with pyside6-rcc."""
+    rcc = shutil.which("pyside6-rcc")
+    if rcc is None:
+        print("Error: pyside6-rcc not found. Install PySide6 or add it to PATH.")
+        return False
+    result = subprocess.run([rcc, QRC_PATH, "-o", RC_MODULE_PATH])
+    return result.returncode == 0
+
+
+def main():
+    """Bake all icons and compile the resource module."""
+    file_names = bake_pngs()
+    print(f"Rendered {len(file_names)} icons to {ICONS_DIR}")
+
+    write_qrc(file_names)
+    print(f"Wrote {QRC_PATH}")
+
+    if compile_qrc():
+        print(f"Compiled resources to {RC_MODULE_PATH}")
+    else:
+        print("Error: Failed to compile icon resources.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # Rendering SVGs needs a GUI application; it stays alive while main() runs
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)
+    main()
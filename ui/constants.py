@@ -18,4 +18,7 @@ MAX_FONT_SIZE = 72
 
 # Default font sizes
 DEFAULT_KB_FONT_SIZE = 25  # Default keyboard font size
-DEFAULT_FONT_SIZE = 14  # Default editor font size
\ No newline at end of file
+DEFAULT_FONT_SIZE = 14  # Default editor font size
+
+# On-screen keyboard timing
+KB_LONG_PRESS_MS = 350  # Hold time before a key with variants opens its popup
\ No newline at end of file
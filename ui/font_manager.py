@@ -6,6 +6,7 @@ handling font loading, discovery, and providing access to available fonts.
 """
 import os
 import logging
+import threading
 from PySide6.QtGui import QFont, QFontDatabase
 from PySide6.QtCore import QObject, Signal
 
@@ -18,6 +19,42 @@ from ui.constants import (
 # Set up logging
 logger = logging.getLogger("FontManager")
 
+# Installed font families, cached because QFontDatabase.families() walks the
+# whole font database. Stored as (names, casefolded names); the lock makes sure
+# concurrent callers build it only once.
+_families_lock = threading.Lock()
+_families_cache = None
+
+
+def available_families():
+    """
+    Get the installed font families, computed once and then reused.
+    
+    Returns:
+        tuple: (frozenset of family names, frozenset of casefolded names).
+    """
+    global _families_cache
+    families = _families_cache
+    if families is None:
+        with _families_lock:
+            if _families_cache is None:
+                names = frozenset(QFontDatabase.families())
+                _families_cache = (names, frozenset(name.casefold() for name in names))
+            families = _families_cache
+    return families
+
+
+def has_family(name):
+    """Check whether a font family is installed (case-insensitive, like QFontDatabase.hasFamily)."""
+    return name.casefold() in available_families()[1]
+
+
+def invalidate_families():
+    """Drop the cached family set, e.g. after application fonts were added."""
+    global _families_cache
+    with _families_lock:
+        _families_cache = None
+
 class FontManager(QObject):
     """
     Centralized font management for the Sinhala Word Processor.
@@ -113,6 +150,7 @@ class FontManager(QObject):
                     font_id = QFontDatabase.addApplicationFont(font_path)
                     
                     if font_id != -1:
+                        invalidate_families()
                         families = QFontDatabase.applicationFontFamilies(font_id)
                         if families:
                             for family in families:
@@ -135,13 +173,13 @@ class FontManager(QObject):
         
         # Check for known Sinhala fonts
         for font_name in known_sinhala_fonts:
-            if QFontDatabase.hasFamily(font_name):
+            if has_family(font_name):
                 self.system_sinhala_fonts.append(font_name)
                 logger.info(f"Found system Sinhala font: {font_name}")
         
         # Look for other fonts with "Sinhala" in the name
-        all_fonts = QFontDatabase.families()
-        for font_name in all_fonts:
+        all_fonts, _ = available_families()
+        for font_name in sorted(all_fonts):
             if ("sinhala" in font_name.lower() or "iskoola" in font_name.lower()) and font_name not in self.system_sinhala_fonts:
                 self.system_sinhala_fonts.append(font_name)
                 logger.info(f"Found additional system Sinhala font: {font_name}")
@@ -216,7 +254,7 @@ class FontManager(QObject):
         Returns:
             bool: True if the font was set successfully, False otherwise.
         """
-        if font_name in self.all_sinhala_fonts or QFontDatabase.hasFamily(font_name):
+        if font_name in self.all_sinhala_fonts or has_family(font_name):
             self.current_font = font_name
             logger.info(f"Font set to: {font_name}")
             return True
@@ -7,19 +7,34 @@ inspired by modern UI styles like Windows 11 Fluent Design.
 """
 
 import sys
+import logging
 from PySide6.QtGui import (
     QIcon, QPixmap, QPainter, QColor, QBrush, QPen, QPainterPath, QFont
 )
 from PySide6.QtCore import Qt, QSize, QRectF, QByteArray
 
+# Set up module-specific logger
+logger = logging.getLogger(__name__)
+
 # Try importing QSvgRenderer for optimal rendering
 try:
     from PySide6.QtSvg import QSvgRenderer
     SVG_SUPPORT = True
 except ImportError:
     SVG_SUPPORT = False
-    print("Warning: PySide6.QtSvg module not found. Falling back to basic QPainter rendering.")
-    print("For best results, install the Qt SVG module (e.g., 'pip install PySide6-Addons')")
+    logger.warning("PySide6.QtSvg module not found. Falling back to basic QPainter rendering. "
+                   "For best results, install the Qt SVG module (e.g., 'pip install PySide6-Addons')")
+
+# Prebaked PNG icons compiled by tools/bake_icons.py (optional)
+try:
+    # Importing the module registers the ":/icons" resources
+    from ui import icons_rc
+    BAKED_ICONS = icons_rc is not None
+except ImportError:
+    BAKED_ICONS = False
+
+# Icon sizes rendered ahead of time by tools/bake_icons.py
+BAKED_ICON_SIZES = (16, 24, 32, 48)
 
 # Dictionary of SVG path data (d attribute) for various icons (designed for 16x16 viewBox)
 # Inspired by Fluent UI / Windows 11 style - simplified and filled shapes
@@ -48,6 +63,36 @@ THEME_COLORS = {
     'dark': QColor("#E0E0E0")   # Light gray for dark background
 }
 
+# SVG template rendered with a neutral fill; the real color is applied at
+# paint time so every theme shares the same parsed renderer.
+SVG_TEMPLATE = (
+    '<svg width="16" height="16" viewBox="0 0 16 16" '
+    'xmlns="http://www.w3.org/2000/svg"><path fill="#000" d="{}"/></svg>'
+)
+
+# Parsed QSvgRenderer instances, keyed by icon name only
+_RENDERERS = {}
+
+# Icon names already reported as missing or broken, so each is logged once
+_warned = set()
+
+
+def _get_renderer(icon_name):
+    """
+    Return the cached QSvgRenderer for an icon, parsing the SVG on first use.
+
+    Raises:
+        ValueError: If the SVG data for the icon is invalid.
+    """
+    renderer = _RENDERERS.get(icon_name)
+    if renderer is None:
+        svg_bytes = QByteArray(SVG_TEMPLATE.format(ICON_PATHS[icon_name]).encode('utf-8'))
+        renderer = QSvgRenderer(svg_bytes)
+        if not renderer.isValid():
+            raise ValueError(f"SVG data for '{icon_name}' is invalid.")
+        _RENDERERS[icon_name] = renderer
+    return renderer
+
 def create_icon(icon_name, size=32, color=THEME_COLORS['light']):
     """
     Creates a QIcon from SVG path data, scaled and colored.
@@ -62,38 +107,33 @@ def create_icon(icon_name, size=32, color=THEME_COLORS['light']):
         QIcon: The generated icon, or an empty QIcon if name not found.
     """
     if icon_name not in ICON_PATHS:
-        print(f"Error: Icon '{icon_name}' not found in ICON_PATHS.")
+        if icon_name not in _warned:
+            logger.error("Icon '%s' not found in ICON_PATHS.", icon_name)
+            _warned.add(icon_name)
         return QIcon()
 
-    path_data = ICON_PATHS[icon_name]
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.transparent)
 
     # --- Primary Method: Use QSvgRenderer if available ---
     if SVG_SUPPORT:
         try:
-            # Construct the full SVG string with the dynamic fill color
-            svg_data = f'''
-                <svg width="16" height="16" viewBox="0 0 16 16"
-                     xmlns="http://www.w3.org/2000/svg">
-                    <path fill="{color.name()}" d="{path_data}"/>
-                </svg>
-            '''
-            svg_bytes = QByteArray(svg_data.encode('utf-8'))
-
-            renderer = QSvgRenderer(svg_bytes)
-            if not renderer.isValid():
-                 # Raise error to trigger fallback if SVG is bad
-                 raise ValueError(f"SVG data for '{icon_name}' is invalid.")
+            # Invalid SVG raises here to trigger the fallback
+            renderer = _get_renderer(icon_name)
 
             painter = QPainter(pixmap)
             painter.setRenderHint(QPainter.Antialiasing)
             renderer.render(painter)
+            # Tint the neutral shape with the requested color
+            painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+            painter.fillRect(QRectF(0, 0, size, size), color)
             painter.end()
             return QIcon(pixmap)
 
         except Exception as e:
-            print(f"Warning: SVG rendering failed for '{icon_name}': {e}. Falling back.")
+            if icon_name not in _warned:
+                logger.warning("SVG rendering failed for '%s': %s. Falling back.", icon_name, e)
+                _warned.add(icon_name)
             # Ensure pixmap is clean for fallback
             pixmap.fill(Qt.transparent)
 
@@ -261,5 +301,11 @@ def get_toolbar_icon(icon_name, theme='light', size=32):
     Returns:
         QIcon: Icon for the given name and theme.
     """
+    # Use the prebaked pixmap when one exists for this combination
+    if BAKED_ICONS and theme in THEME_COLORS and size in BAKED_ICON_SIZES:
+        pixmap = QPixmap(f":/icons/{icon_name}_{theme}_{size}.png")
+        if not pixmap.isNull():
+            return QIcon(pixmap)
+
     color = THEME_COLORS.get(theme, THEME_COLORS['light'])
     return create_icon(icon_name, size=size, color=color)
\ No newline at end of file
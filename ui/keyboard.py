@@ -1,5 +1,10 @@
 import os
+import re
+import sys
 import logging
+import unicodedata
+from functools import partial
+from types import MappingProxyType
 # Allow limited font fallbacks for better compatibility
 # We'll handle font fallbacks more carefully in the code
 os.environ["QT_ENABLE_FONT_FALLBACKS"] = "1"
@@ -8,18 +13,22 @@ os.environ["QT_FONT_NO_SYSTEM_FALLBACKS"] = "0"
 # Set up module-specific logger
 logger = logging.getLogger(__name__)
 
+# Keyboard diagnostics are only built and logged when SINHALA_KB_DEBUG is set
+_DEBUG = bool(os.environ.get("SINHALA_KB_DEBUG"))
+
 # Import constants
 from ui.constants import (
-    MIN_KB_FONT, MAX_KB_FONT, BASE_KB_HEIGHT, BASE_KB_FONT, DEFAULT_KB_FONT_SIZE
+    MIN_KB_FONT, MAX_KB_FONT, BASE_KB_HEIGHT, BASE_KB_FONT, DEFAULT_KB_FONT_SIZE,
+    KB_LONG_PRESS_MS
 )
 
 # Import FontManager
 from ui.font_manager import FontManager
 
 from PySide6.QtWidgets import (QFrame, QHBoxLayout, QVBoxLayout, QPushButton, QWidget, 
-                          QSizePolicy, QDialog, QLabel, QGridLayout, QSplitter)
-from PySide6.QtCore import Qt, Signal, QObject, QEvent, QSize
-from PySide6.QtGui import QColor, QFont, QCursor, QResizeEvent, QFontDatabase
+                          QSizePolicy, QDialog, QLabel, QGridLayout, QSplitter, QButtonGroup)
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer, QRect
+from PySide6.QtGui import QColor, QFont, QCursor, QResizeEvent, QFontDatabase, QScreen
 
 # Import ResizeState enum from main.py to ensure consistency
 from enum import Enum
@@ -28,6 +37,320 @@ class ResizeState(Enum):
     USER = 1  # mouse/drag
     PROGRAMMATIC = 2
 
+# --- Key layout ---
+# Grid rows as (row index, keys) pairs; Space and Backspace are added after row 4.
+
+
+def _intern_keys(keys):
+    """Return the key strings NFC-normalized and interned, as a tuple"""
+    return tuple(sys.intern(unicodedata.normalize("NFC", key)) for key in keys)
+
+
+_VOWELS = _intern_keys(('අ', 'ආ', 'ඇ', 'ඈ', 'ඉ', 'ඊ', 'උ', 'ඌ', 'එ', 'ඒ', 'ඔ', 'ඕ'))
+_ROW1 = _intern_keys(('ු', 'ූ', 'ෙ', 'ේ', 'ෛ', 'ො', 'ෝ', 'ෞ', 'ක', 'ඛ', 'ග', 'ඝ', 'ඟ', 'ච', 'ඡ'))
+_ROW2 = _intern_keys(('ජ', 'ඣ', 'ඤ', 'ඥ', 'ට', 'ඨ', 'ඩ', 'ඪ', 'ණ', 'ඬ', 'ත', 'ථ', 'ද', 'ධ', 'න'))
+_ROW3 = _intern_keys(('ඳ', 'ප', 'ඵ', 'බ', 'භ', 'ම', 'ඹ', 'ය', 'ර', 'ල', 'ව', 'ශ', 'ෂ', 'ස', 'හ'))
+_ROW4 = _intern_keys(('ළ', 'ෆ', 'ං', 'ඃ', '්', 'ා', 'ැ', 'ෑ', 'ි', 'ී'))
+
+_ROW_LAYOUT = ((0, _VOWELS), (1, _ROW1), (2, _ROW2), (3, _ROW3), (4, _ROW4))
+
+# --- Key tables ---
+# Read-only and shared by every keyboard instance. The letters are NFC-normalized
+# and interned (see _intern_keys) so the grid rows, the ordered tuples, the
+# lookup sets and the popup tables all share one string object per character.
+
+# Letters that can have vowel modifiers (all Sinhala consonants)
+_CONSONANTS = _intern_keys((
+    'ක', 'ඛ', 'ග', 'ඝ', 'ඟ', 'ච', 'ඡ', 'ජ', 'ඣ', 'ඤ', 'ඥ',
+    'ට', 'ඨ', 'ඩ', 'ඪ', 'ණ', 'ඬ', 'ත', 'ථ', 'ද', 'ධ', 'න', 'ඳ',
+    'ප', 'ඵ', 'බ', 'භ', 'ම', 'ඹ', 'ය', 'ර', 'ල', 'ව', 'ශ', 'ෂ',
+    'ස', 'හ', 'ළ', 'ෆ',
+))
+
+# Vowel modifiers for layout
+_MODIFIERS = _intern_keys(('ු', 'ූ', 'ෙ', 'ේ', 'ෛ', 'ො', 'ෝ', 'ෞ'))
+
+# Keyboard layouts with simplified sections
+_KEYS = MappingProxyType({
+    'vowels': _VOWELS,
+    'consonants': _CONSONANTS,
+    # Special characters and modifiers
+    'special': _intern_keys(('ං', 'ඃ', '්', 'ා', 'ැ', 'ෑ', 'ි', 'ී', 'ු', 'ූ')),
+    'modifiers': _MODIFIERS,
+})
+
+_CONSONANTS_SET = frozenset(_CONSONANTS)
+_MODIFIERS_SET = frozenset(_MODIFIERS)
+
+# Vowel groups for popups - only for අ
+_VOWEL_GROUPS = MappingProxyType({
+    'අ': _intern_keys(('අ', 'ආ', 'ඇ', 'ඈ')),
+})
+
+# Vowel modifiers for consonants
+_VOWEL_MODIFIERS = frozenset(_intern_keys([
+    '',      # No modifier (base consonant)
+    'ා',    # aa
+    'ැ',    # ae
+    'ෑ',    # aae
+    'ි',    # i
+    'ී',    # ii
+    'ු',    # u
+    'ූ',    # uu
+    'ෘ',    # ru
+    'ෙ',    # e
+    'ේ',    # ee
+    'ෛ',    # ai
+    'ො',    # o
+    'ෝ',    # oo
+    'ෞ',    # au
+    '්'     # hal kirima
+]))
+
+# Which vowel modifiers can be used with which letters, based on Sinhala language rules.
+# The tuples never contain the empty "no modifier" entry, so they can be used as-is.
+_VALID_MODIFIERS = MappingProxyType({
+    # Vowels have limited or no modifiers
+    'අ': _intern_keys(('ා', 'ැ', 'ෑ', 'ි', 'ී', 'ු', 'ූ', '්')),
+    'ආ': _intern_keys(('්',)),
+    'ඇ': _intern_keys(('්',)),
+    'ඈ': _intern_keys(('්',)),
+    'ඉ': _intern_keys(('්',)),
+    'ඊ': _intern_keys(('්',)),
+    'උ': _intern_keys(('්',)),
+    'ඌ': _intern_keys(('්',)),
+    'ඍ': _intern_keys(('්',)),
+    'ඎ': _intern_keys(('්',)),
+    'ඏ': _intern_keys(('්',)),
+    'ඐ': _intern_keys(('්',)),
+
+    # Special consonant with no vowel modifiers
+    'ඞ': _intern_keys(('්',)),
+
+    # Default set of modifiers for most consonants
+    'DEFAULT': _intern_keys(('ා', 'ැ', 'ෑ', 'ි', 'ී', 'ු', 'ූ', 'ෘ', 'ෙ', 'ේ', 'ෛ', 'ො', 'ෝ', 'ෞ', '්')),
+})
+
+# --- Shared stylesheets ---
+# Built once at import time and combined into a single sheet on the keyboard
+# frame, so Qt parses the rules once and polishes all buttons in one pass.
+# Letter keys are matched by their role="key" property and the Space and
+# Backspace buttons by object name.
+
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,])\s*")
+_CSS_SPACE_RE = re.compile(r"\s+")
+
+
+def _minify_css(css):
+    """Collapse a stylesheet to one compact line so Qt has less to tokenize"""
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    return css.replace(": ", ":").strip()
+
+_LIGHT_FRAME_CSS = _minify_css("""
+    SinhalaKeyboard {
+        background-color: #f0f0f0;
+        border: 1px solid #cccccc;
+        border-radius: 10px;
+    }
+""")
+
+_DARK_FRAME_CSS = _minify_css("""
+    SinhalaKeyboard {
+        background-color: #2d2d2d;
+        border: 1px solid #444444;
+        border-radius: 10px;
+    }
+""")
+
+_LIGHT_SPACE_CSS = _minify_css("""
+    QPushButton#space {
+        border: 1px solid #aaaaaa;
+        border-radius: 6px;
+        background-color: #f0f0f0;
+        color: #000000;
+        padding: 2px;
+        text-align: center;
+    }
+    QPushButton#space:hover {
+        background-color: #e6f0ff;
+        border: 1px solid #4d94ff;
+    }
+    QPushButton#space:pressed {
+        background-color: #99c2ff;
+        border: 2px solid #0066ff;
+    }
+""")
+
+_DARK_SPACE_CSS = _minify_css("""
+    QPushButton#space {
+        border: 1px solid #555555;
+        border-radius: 6px;
+        background-color: #444444;
+        color: #ffffff;
+        padding: 2px;
+        text-align: center;
+    }
+    QPushButton#space:hover {
+        background-color: #4d4d4d;
+        border: 1px solid #6699cc;
+    }
+    QPushButton#space:pressed {
+        background-color: #555555;
+        border: 2px solid #6699cc;
+    }
+""")
+
+_LIGHT_BACKSPACE_CSS = _minify_css("""
+    QPushButton#backspace {
+        border: 1px solid #aaaaaa;
+        border-radius: 6px;
+        background-color: #f0f0f0;
+        color: #000000;
+        padding: 2px;
+        text-align: center;
+    }
+    QPushButton#backspace:hover {
+        background-color: #ffe6e6;
+        border: 1px solid #ff4d4d;
+    }
+    QPushButton#backspace:pressed {
+        background-color: #ffb3b3;
+        border: 2px solid #ff0000;
+    }
+""")
+
+_DARK_BACKSPACE_CSS = _minify_css("""
+    QPushButton#backspace {
+        border: 1px solid #555555;
+        border-radius: 6px;
+        background-color: #444444;
+        color: #ffffff;
+        padding: 2px;
+        text-align: center;
+    }
+    QPushButton#backspace:hover {
+        background-color: #663333;
+        border: 1px solid #cc6666;
+    }
+    QPushButton#backspace:pressed {
+        background-color: #804040;
+        border: 2px solid #cc6666;
+    }
+""")
+
+# Resize hint under the key grid (same in both themes)
+_RESIZE_HINT_CSS = _minify_css("""
+    QLabel {
+        color: #666666;
+        font-size: 11px;
+        font-weight: bold;
+        padding: 2px;
+        background-color: transparent;
+        border-top: 1px dotted #aaaaaa;
+        border-bottom: 1px dotted #aaaaaa;
+    }
+""")
+
+# Popup dialog and variant buttons for both themes. The dialog's
+# "theme" property picks the rules, so a theme change only re-polishes the
+# pooled popup instead of rebuilding it with another sheet.
+_POPUP_DIALOG_CSS = _minify_css("""
+    QDialog[theme="light"] {
+        background-color: #f5f5f5;
+        border: 1px solid #cccccc;
+        border-radius: 10px;
+    }
+    QDialog[theme="light"] QPushButton {
+        background-color: #ffffff;
+        color: #000000;
+        border: 1px solid #aaaaaa;
+        border-radius: 8px;
+    }
+    QDialog[theme="light"] QPushButton:hover {
+        background-color: #e6f0ff;
+        border: 1px solid #4d94ff;
+    }
+    QDialog[theme="light"] QPushButton:pressed {
+        background-color: #99c2ff;
+        border: 2px solid #0066ff;
+    }
+    QDialog[theme="dark"] {
+        background-color: #333333;
+        border: 1px solid #555555;
+        border-radius: 10px;
+    }
+    QDialog[theme="dark"] QPushButton {
+        background-color: #3c3c3c;
+        color: #ffffff;
+        border: 1px solid #555555;
+        border-radius: 8px;
+    }
+    QDialog[theme="dark"] QPushButton:hover {
+        background-color: #4d4d4d;
+        border: 1px solid #6699cc;
+    }
+    QDialog[theme="dark"] QPushButton:pressed {
+        background-color: #555555;
+        border: 2px solid #6699cc;
+    }
+""")
+
+# Letter key rules; radius and padding follow the key size (see get_button_style)
+_LIGHT_KEY_CSS_TEMPLATE = _minify_css("""
+    QPushButton[role="key"] {{
+        border: 1px solid #aaaaaa;
+        border-radius: {radius}px;
+        background-color: #ffffff;
+        color: #000000;
+        padding: {padding}px;
+        text-align: center;
+    }}
+    QPushButton[role="key"]:hover {{
+        background-color: #e6f0ff;
+        border: 1px solid #4d94ff;
+    }}
+    QPushButton[role="key"]:pressed {{
+        background-color: #99c2ff;
+        border: 1px solid #0066ff;
+    }}
+""")
+
+_DARK_KEY_CSS_TEMPLATE = _minify_css("""
+    QPushButton[role="key"] {{
+        border: 1px solid #555555;
+        border-radius: {radius}px;
+        background-color: #3c3c3c;
+        color: #ffffff;
+        padding: {padding}px;
+        text-align: center;
+    }}
+    QPushButton[role="key"]:hover {{
+        background-color: #4d4d4d;
+        border: 1px solid #6699cc;
+    }}
+    QPushButton[role="key"]:pressed {{
+        background-color: #555555;
+        border: 1px solid #6699cc;
+    }}
+""")
+
+
+# Key button stylesheets, keyed by (dark_mode, padding, border_radius)
+_BUTTON_CSS_CACHE = {}
+
+# Complete keyboard stylesheets, keyed by (dark_mode, key button stylesheet)
+_KEYBOARD_CSS_CACHE = {}
+
+# Popup button size rule; the size excludes the 1px border on each side
+_POPUP_SIZE_CSS_TEMPLATE = (
+    "QPushButton{{min-width:{size}px;max-width:{size}px;"
+    "min-height:{size}px;max-height:{size}px}}"
+)
+
+# Complete popup stylesheets, keyed by popup button size
+_POPUP_CSS_CACHE = {}
+
 class SinhalaKeyboard(QFrame):
     """PySide6 implementation of the Sinhala Keyboard with resizing capability"""
 
@@ -36,6 +359,10 @@ class SinhalaKeyboard(QFrame):
     
     # Signal emitted when keyboard is resized
     keyboardResized = Signal(int)
+    
+    # Signal emitted with the number of coalesced Backspace presses
+    # (only used when debounce_ms is enabled)
+    backspacePressed = Signal(int)
 
     def __init__(self, parent=None, dark_mode=False, font_size=None):
         super().__init__(parent)
@@ -44,11 +371,8 @@ class SinhalaKeyboard(QFrame):
         # Create FontManager instance
         self.font_manager = FontManager()
         
-        # Get the font family from the font manager
-        self.keyboard_font_family = self.font_manager.current_font
-        
-        # Always use the font size from the font manager
-        self.font_size = self.font_manager.current_keyboard_font_size
+        # Take the font family and size from the font manager
+        self.load_keyboard_font()
         
         # Connect to the font manager's signal
         self.font_manager.fontSizeChanged.connect(self.on_font_size_changed)
@@ -62,6 +386,7 @@ class SinhalaKeyboard(QFrame):
         self._last_resize_time = 0
         self._resize_count = 0
         self._last_emitted_height = 0
+        self._last_drag_height = None
         
         # Default height for the keyboard
         self.default_height = 600  # Increased default height for better visibility
@@ -73,9 +398,67 @@ class SinhalaKeyboard(QFrame):
         
         # Initialize grid_layout to None - will be created in create_keyboard
         self.grid_layout = None
+        self._grid_min_size = None
+        
+        # The key grid is built on first show (see showEvent)
+        self._built = False
+        
+        # Buttons created by create_keyboard, kept so updates don't walk the widget tree
+        self._standard_buttons = []
+        self._key_group = None
+        self._key_by_id = []
+        self._space_btn = None
+        self._backspace_btn = None
+        
+        # Key button stylesheet and full sheet currently applied to the keyboard
+        self.button_style = None
+        self._applied_sheet = None
+        
+        # Variant popup shared by the vowel and modifier keys, built on first
+        # use and restyled in place on theme changes (see _ensure_variant_popup)
+        self._variant_popup = None
+        
+        # Geometry of the screen popups are clamped to, looked up on first use
+        # and kept current through the screen's geometryChanged and the
+        # window's screenChanged signals
+        self._screen_geom = None
+        self._watched_screen = None
+        self._watched_window = None
+        
+        # Bold fonts shared by all key and popup buttons
+        # (see _get_button_font and _get_popup_font)
+        self._button_font = None
+        self._button_font_key = None
+        self._applied_button_font = None
+        self._popup_font = None
+        self._popup_font_key = None
+        
+        # Optional Backspace debounce window in milliseconds (0 = disabled).
+        # When enabled, rapid presses are counted and delivered once through
+        # backspacePressed instead of one keyPressed("Backspace") each. The
+        # main window sets it from the "keyboard_backspace_debounce_ms" preference.
+        self.debounce_ms = 0
+        self._pending_backspaces = 0
+        self._backspace_timer = QTimer(self)
+        self._backspace_timer.setSingleShot(True)
+        self._backspace_timer.timeout.connect(self._flush_backspaces)
+        
+        # Long-press detection for keys with a vowel variant popup
+        self._long_press_button = None
+        self._long_press_timer = QTimer(self)
+        self._long_press_timer.setSingleShot(True)
+        self._long_press_timer.timeout.connect(self._open_vowel_popup)
+        
+        # Coalesces the resize events of an edge drag into one update_buttons
+        # per frame (see resizeEvent)
+        self._drag_update_timer = QTimer(self)
+        self._drag_update_timer.setSingleShot(True)
+        self._drag_update_timer.setInterval(16)
+        self._drag_update_timer.timeout.connect(self.update_buttons)
         
         # Log debug info
-        logger.info(f"Keyboard initialized with font: {self.keyboard_font_family}, size: {self.font_size}")
+        if _DEBUG:
+            logger.debug("Keyboard initialized with font: %s, size: %s", self.keyboard_font_family, self.font_size)
         
         # Define keyboard layouts and other properties
         self.setup_keyboard_properties()
@@ -92,28 +475,26 @@ class SinhalaKeyboard(QFrame):
         # Set the initial size to a reasonable default
         self.resize(800, self.default_height)
         
-        # Create the keyboard UI - this will initialize the layout
-        self.create_keyboard()
-        
-        # Apply initial styling based on theme - AFTER layout is created
+        # Apply initial styling based on theme; the key grid itself is
+        # created lazily in showEvent so startup doesn't pay for it
         self.update_theme()
         
         # Set size policy to allow both horizontal and vertical resizing
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
     def load_keyboard_font(self):
-        """Load Sinhala font for the keyboard buttons using the FontManager"""
-        # This method is kept for backward compatibility
-        # The actual font loading is now handled by the FontManager
-        
+        """Take the keyboard font family and size from the FontManager"""
         # Update the font family from the font manager
         self.keyboard_font_family = self.font_manager.current_font
         
         # Always use the font size from the font manager
         self.font_size = self.font_manager.current_keyboard_font_size
+        self._recompute_button_size()
             
-        logger.info(f"Keyboard using font: {self.keyboard_font_family}, size: {self.font_size}")
+        if _DEBUG:
+            logger.debug("Keyboard using font: %s, size: %s", self.keyboard_font_family, self.font_size)
         
+    @Slot(int)
     def on_font_size_changed(self, size):
         """
         Handle font size changes from the FontManager.
@@ -121,121 +502,113 @@ class SinhalaKeyboard(QFrame):
         Args:
             size (int): The new font size.
         """
-        logger.info(f"Received font size change: {size}")
+        if _DEBUG:
+            logger.debug("Received font size change: %s", size)
+        # Nothing to restyle if this keyboard already uses the size
+        if size == self.font_size:
+            return
         self.font_size = size
+        self._recompute_button_size()
         # Update the buttons with the new font size
         self.update_buttons()
 
     def setup_keyboard_properties(self):
         """Define keyboard layouts and properties"""
-        # Define keyboard layouts with simplified sections
-        self.keys = {
-            # Vowels section
-            'vowels': ['අ', 'ආ', 'ඇ', 'ඈ', 'ඉ', 'ඊ', 'උ', 'ඌ', 'එ', 'ඒ', 'ඔ', 'ඕ'],
-
-            # Consonants section (all Sinhala consonants)
-            'consonants': ['ක', 'ඛ', 'ග', 'ඝ', 'ඟ', 'ච', 'ඡ', 'ජ', 'ඣ', 'ඤ', 'ඥ', 
-                          'ට', 'ඨ', 'ඩ', 'ඪ', 'ණ', 'ඬ', 'ත', 'ථ', 'ද', 'ධ', 'න', 'ඳ',
-                          'ප', 'ඵ', 'බ', 'භ', 'ම', 'ඹ', 'ය', 'ර', 'ල', 'ව', 'ශ', 'ෂ',
-                          'ස', 'හ', 'ළ', 'ෆ'],
-
-            # Special characters and modifiers
-            'special': ['ං', 'ඃ', '්', 'ා', 'ැ', 'ෑ', 'ි', 'ී', 'ු', 'ූ'],
-
-            # Vowel modifiers for layout
-            'modifiers': ['ු', 'ූ', 'ෙ', 'ේ', 'ෛ', 'ො', 'ෝ', 'ෞ']
-        }
-
-        # Define vowel groups for popups - only for අ
-        self.vowel_groups = {
-            'අ': ['අ', 'ආ', 'ඇ', 'ඈ']
-        }
-
-        # Define vowel modifiers for consonants
-        self.vowel_modifiers = {
-            '': '',      # No modifier (base consonant)
-            'ා': 'ා',    # aa
-            'ැ': 'ැ',    # ae
-            'ෑ': 'ෑ',    # aae
-            'ි': 'ි',    # i
-            'ී': 'ී',    # ii
-            'ු': 'ු',    # u
-            'ූ': 'ූ',    # uu
-            'ෘ': 'ෘ',    # ru
-            'ෙ': 'ෙ',    # e
-            'ේ': 'ේ',    # ee
-            'ෛ': 'ෛ',    # ai
-            'ො': 'ො',    # o
-            'ෝ': 'ෝ',    # oo
-            'ෞ': 'ෞ',    # au
-            '්': '්'     # hal kirima
-        }
-
-        # Define letters that can have vowel modifiers
-        self.consonants = [
-            'ක', 'ඛ', 'ග', 'ඝ', 'ඟ', 'ච', 'ඡ', 'ජ', 'ඣ', 'ඤ', 'ඥ',
-            'ට', 'ඨ', 'ඩ', 'ඪ', 'ණ', 'ඬ', 'ත', 'ථ', 'ද', 'ධ', 'න', 'ඳ',
-            'ප', 'ඵ', 'බ', 'භ', 'ම', 'ඹ', 'ය', 'ර', 'ල', 'ව', 'ශ', 'ෂ',
-            'ස', 'හ', 'ළ', 'ෆ'
-        ]
-
-        # Define which vowel modifiers can be used with which letters
-        # This mapping defines valid combinations based on Sinhala language rules
-        self.valid_modifiers = {
-            # Vowels have limited or no modifiers
-            'අ': ['ා', 'ැ', 'ෑ', 'ි', 'ී', 'ු', 'ූ', '්'],
-            'ආ': ['්'],
-            'ඇ': ['්'],
-            'ඈ': ['්'],
-            'ඉ': ['්'],
-            'ඊ': ['්'],
-            'උ': ['්'],
-            'ඌ': ['්'],
-            'ඍ': ['්'],
-            'ඎ': ['්'],
-            'ඏ': ['්'],
-            'ඐ': ['්'],
-
-            # Special consonant with no vowel modifiers
-            'ඞ': ['්'],
-
-            # Default set of modifiers for most consonants
-            'DEFAULT': ['ා', 'ැ', 'ෑ', 'ි', 'ී', 'ු', 'ූ', 'ෘ', 'ෙ', 'ේ', 'ෛ', 'ො', 'ෝ', 'ෞ', '්']
-        }
+        # The key tables are read-only module constants shared by every keyboard
+        self.keys = _KEYS
+        self.vowel_groups = _VOWEL_GROUPS
+        self.vowel_modifiers = _VOWEL_MODIFIERS
+        self.consonants = _CONSONANTS
+        self.valid_modifiers = _VALID_MODIFIERS
+        self._default_modifiers = _VALID_MODIFIERS['DEFAULT']
+
+        # Sets for constant-time key classification in on_key_clicked
+        self._consonants_set = _CONSONANTS_SET
+        self._modifiers_set = _MODIFIERS_SET
+
+        # Popup contents per letter, computed on first use by modifier_combinations
+        self._combined_by_consonant = None
+
+        # Key rows in grid order
+        self.rows = _ROW_LAYOUT
+
+    def _recompute_button_size(self):
+        """Recompute the base key size after the font size changes"""
+        self.button_size = max(46, self.font_size + 20)  # Scale button size with font size
+        # Popup sizes follow the font size too
+        self._popup_metrics = None
+
+    def modifier_combinations(self, letter):
+        """Return the base letter followed by each valid letter + modifier combination"""
+        if self._combined_by_consonant is None:
+            # Precompute the popup contents for every letter in one pass
+            combined = {}
+            get_modifiers = self.valid_modifiers.get
+            default_modifiers = self._default_modifiers
+            letters = [*self.consonants, *(k for k in self.valid_modifiers if k != 'DEFAULT')]
+            for base in letters:
+                modifiers = get_modifiers(base, default_modifiers)
+                combined[base] = [base] + [sys.intern(base + m) for m in modifiers]
+            self._combined_by_consonant = combined
+
+        combinations = self._combined_by_consonant.get(letter)
+        if combinations is None:
+            # Any other letter gets the default modifiers; remember it as well
+            modifiers = self._default_modifiers
+            combinations = [letter] + [sys.intern(letter + m) for m in modifiers]
+            self._combined_by_consonant[letter] = combinations
+        return combinations
+
+    def showEvent(self, event):
+        """Build the key grid the first time the keyboard is shown"""
+        if not self._built:
+            self._built = True
+            self.create_keyboard()
+        # Docking or floating the keyboard may put it on another screen
+        self._screen_geom = None
+        super().showEvent(event)
 
     def update_theme(self):
         """Update the keyboard styling based on the current theme"""
+        self._apply_popup_theme()
+        
+        # Once the grid exists, update_buttons re-applies the keyboard sheet for
+        # the size the keys actually have, so the sheet is set once per switch
+        if hasattr(self, 'grid_layout') and self.grid_layout is not None:
+            logger.debug("Updating buttons after theme change")
+            self.update_buttons()
+            return
+        
+        logger.debug("Skipping button update - layout not ready yet")
         if self.dark_mode:
             # Dark mode styling
-            self.setStyleSheet("""
-                SinhalaKeyboard {
-                    background-color: #2d2d2d;
-                    border: 1px solid #444444;
-                    border-radius: 10px;
-                }
-            """)
             self.button_style = self.get_dark_button_style()
         else:
             # Light mode styling
-            self.setStyleSheet("""
-                SinhalaKeyboard {
-                    background-color: #f0f0f0;
-                    border: 1px solid #cccccc;
-                    border-radius: 10px;
-                }
-            """)
             self.button_style = self.get_light_button_style()
-        
-        # Update all existing buttons with the new style and size
-        # Only if the grid layout has been initialized
-        if hasattr(self, 'grid_layout') and self.grid_layout is not None:
-            print("Updating buttons after theme change")
-            self.update_buttons()
-        else:
-            print("Skipping button update - layout not ready yet")
+        self.apply_stylesheet()
+
+    def apply_stylesheet(self):
+        """Apply the frame, key, Space and Backspace rules as one stylesheet on the keyboard"""
+        key = (self.dark_mode, self.button_style)
+        sheet = _KEYBOARD_CSS_CACHE.get(key)
+        if sheet is None:
+            frame_style = _DARK_FRAME_CSS if self.dark_mode else _LIGHT_FRAME_CSS
+            sheet = (frame_style + self.button_style +
+                     self.get_space_button_style() + self.get_backspace_button_style())
+            _KEYBOARD_CSS_CACHE[key] = sheet
+
+        # Setting an identical sheet would still make Qt re-parse and repolish
+        if sheet is self._applied_sheet:
+            return
+        self._applied_sheet = sheet
+        self.setStyleSheet(sheet)
 
     def set_dark_mode(self, is_dark):
         """Set the keyboard theme to dark or light mode"""
+        # Nothing to restyle if the theme is unchanged
+        if is_dark == self.dark_mode:
+            return
         self.dark_mode = is_dark
         self.update_theme()
         
@@ -258,7 +631,7 @@ class SinhalaKeyboard(QFrame):
             dialog.setWindowFlags(dialog.windowFlags() | Qt.Tool)  # Make it a tool window
             
             # Handle dialog close event to properly re-embed the keyboard
-            dialog.closeEvent = lambda event: self._handle_dialog_close(event, original_parent, dialog)
+            dialog.closeEvent = partial(self._handle_dialog_close, original_parent=original_parent, dialog=dialog)
             
             # Create layout for the dialog with minimal margins
             layout = QVBoxLayout(dialog)
@@ -436,7 +809,8 @@ class SinhalaKeyboard(QFrame):
         min_height = 200
         height = max(min_height, height)
         
-        logger.info(f"Calculated keyboard height: {height} for font size: {font_size}")
+        if _DEBUG:
+            logger.debug("Calculated keyboard height: %s for font size: %s", height, font_size)
         return height
         
     def set_font_size(self, size):
@@ -446,15 +820,19 @@ class SinhalaKeyboard(QFrame):
         """
         # Let the FontManager handle the size validation and update
         # This will trigger the fontSizeChanged signal which this widget listens to
-        self.font_manager.set_keyboard_font_size(size)
+        size = self.font_manager.set_keyboard_font_size(size)
         
-        # Update the buttons to reflect the new font size
-        self.update_buttons()
+        # The signal only fires when the manager's size changes; catch up if this
+        # keyboard was showing a different size (a no-op when it already matches)
+        self.on_font_size_changed(size)
         # The flag will be reset by a timer after a delay
         # This prevents resize loops when the keyboard is resized
         
     def update_buttons(self):
         """Update all existing buttons with the current style and size"""
+        # Nothing to update until the key grid has been built on first show
+        if not self._built:
+            return
         try:
             # Get the current resize state
             in_resize_operation = hasattr(self, 'resize_in_progress') and self.resize_in_progress
@@ -521,7 +899,9 @@ class SinhalaKeyboard(QFrame):
             if in_resize_operation and has_pre_resize_font:
                 # During resize, maintain the pre-resize font size
                 self.font_size = self._pre_resize_font_size
-                logger.debug(f"Using stored pre-resize font size: {self._pre_resize_font_size}")
+                self._recompute_button_size()
+                if _DEBUG:
+                    logger.debug("Using stored pre-resize font size: %s", self._pre_resize_font_size)
             elif not any([
                 # Skip automatic font adjustment if any of these conditions are true
                 hasattr(self, '_manual_font_size') and self._manual_font_size,
@@ -530,60 +910,68 @@ class SinhalaKeyboard(QFrame):
             ]):
                 # We'll skip automatic font size adjustment to respect user preferences
                 # This ensures the font size remains consistent with what the user has selected
-                logger.debug(f"Maintaining current font size: {self.font_size} (button size: {button_size})")
-            else:
+                if _DEBUG:
+                    logger.debug("Maintaining current font size: %s (button size: %s)", self.font_size, button_size)
+            elif _DEBUG:
                 # Log why we're skipping automatic adjustment
                 if in_resize_operation:
-                    logger.debug(f"Skipping font size adjustment during resize operation")
+                    logger.debug("Skipping font size adjustment during resize operation")
                 elif in_programmatic_resize:
-                    logger.debug(f"Skipping font size adjustment during programmatic resize")
+                    logger.debug("Skipping font size adjustment during programmatic resize")
                 else:
-                    logger.debug(f"Skipping font size adjustment (manual font size: {self.font_size})")
+                    logger.debug("Skipping font size adjustment (manual font size: %s)", self.font_size)
 
-            # Create font with better fallback strategy
-            font = QFont(self.keyboard_font_family, adjusted_font_size)
-            font.setStyleStrategy(QFont.StyleStrategy.PreferMatch)
-            font.setBold(True)
+            font = self._get_button_font(adjusted_font_size)
 
-            # Update all existing buttons
-            for child in self.findChildren(QPushButton):
-                try:
-                    # Set font directly
-                    child.setFont(font)
+            # Re-apply the keyboard stylesheet only if the key style for this size differs
+            button_style = self.get_button_style(button_size)
+            if button_style is not self.button_style:
+                self.button_style = button_style
+                self.apply_stylesheet()
 
-                    # Apply stylesheet for styling with button_size parameter
-                    if child.text() not in ["Space", "Backspace"]:
-                        child.setStyleSheet(self.get_button_style(button_size))
-                        
-                        # Set minimum size but don't fix the size
-                        child.setMinimumSize(min_button_size, min_button_size)
-                        
-                        # Set size policy to allow the button to grow and shrink with the layout
-                        child.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                    elif child.text() == "Space":
-                        child.setStyleSheet(self.get_space_button_style())
-                        child.setMinimumHeight(min_button_size)
-                        child.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                    elif child.text() == "Backspace":
-                        child.setStyleSheet(self.get_backspace_button_style())
-                        child.setMinimumHeight(min_button_size)
-                        child.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            # Minimum key size is enforced by the grid rows and columns
+            self._set_grid_minimum(min_button_size)
 
-                except Exception as e:
-                    print(f"Error updating button {child.text()}: {e}")
-                    # If there was an error, try with a system font as fallback
-                    try:
-                        fallback_font = QFont("Arial", 12)
-                        child.setFont(fallback_font)
-                    except:
-                        pass
+            # Update all existing buttons; styling comes from the keyboard
+            # stylesheet and sizing from the grid, so only the font is per button
+            # and only needs setting when it changed
+            if font is not self._applied_button_font:
+                self._applied_button_font = font
+                self._apply_button_font(font)
                         
             # Force the grid layout to update - but only if not in a resize operation
             if not in_resize_operation and not in_programmatic_resize:
                 grid_layout.update()
             
         except Exception as e:
-            print(f"Error in update_buttons: {e}")
+            logger.error(f"Error in update_buttons: {e}")
+
+    def _get_button_font(self, size):
+        """Return the shared bold key font, rebuilding it only when the family or size changes"""
+        key = (self.keyboard_font_family, size)
+        if self._button_font is None or self._button_font_key != key:
+            # Create font with better fallback strategy
+            font = QFont(self.keyboard_font_family, size)
+            font.setStyleStrategy(QFont.StyleStrategy.PreferMatch)
+            font.setBold(True)
+            self._button_font = font
+            self._button_font_key = key
+        return self._button_font
+
+    def _apply_button_font(self, font):
+        """Set the key font on every keyboard button"""
+        for child in self._standard_buttons + [self._space_btn, self._backspace_btn]:
+            try:
+                # Set font directly
+                child.setFont(font)
+            except Exception as e:
+                logger.error(f"Error updating button {child.text()}: {e}")
+                # If there was an error, try with a system font as fallback
+                try:
+                    fallback_font = QFont("Arial", 12)
+                    child.setFont(fallback_font)
+                except:
+                    pass
 
     def get_button_style(self, button_size):
         """Get the button style with the specified size based on current theme"""
@@ -596,215 +984,69 @@ class SinhalaKeyboard(QFrame):
         # Use smaller border radius for a more compact appearance
         border_radius = max(1, min(4, int(button_size * 0.1)))
         
-        if self.dark_mode:
-            return f"""
-                QPushButton {{
-                    border: 1px solid #555555;
-                    border-radius: {border_radius}px;
-                    background-color: #3c3c3c;
-                    color: #ffffff;
-                    padding: {padding}px;
-                    text-align: center;
-                }}
-                QPushButton:hover {{
-                    background-color: #4d4d4d;
-                    border: 1px solid #6699cc;
-                }}
-                QPushButton:pressed {{
-                    background-color: #555555;
-                    border: 1px solid #6699cc;
-                }}
-            """
-        else:
-            return f"""
-                QPushButton {{
-                    border: 1px solid #aaaaaa;
-                    border-radius: {border_radius}px;
-                    background-color: #ffffff;
-                    color: #000000;
-                    padding: {padding}px;
-                    text-align: center;
-                }}
-                QPushButton:hover {{
-                    background-color: #e6f0ff;
-                    border: 1px solid #4d94ff;
-                }}
-                QPushButton:pressed {{
-                    background-color: #99c2ff;
-                    border: 1px solid #0066ff;
-                }}
-            """
+        key = (self.dark_mode, padding, border_radius)
+        style = _BUTTON_CSS_CACHE.get(key)
+        if style is not None:
+            return style
+        
+        template = _DARK_KEY_CSS_TEMPLATE if self.dark_mode else _LIGHT_KEY_CSS_TEMPLATE
+        style = template.format(radius=border_radius, padding=padding)
+        _BUTTON_CSS_CACHE[key] = style
+        return style
     
     def get_light_button_style(self):
         """Get the button style for light mode"""
-        # Use the loaded font family and specified font size
-        button_size = max(46, self.font_size + 20)  # Scale button size with font size
-        return self.get_button_style(button_size)
+        return self.get_button_style(self.button_size)
 
     def get_dark_button_style(self):
         """Get the button style for dark mode"""
-        # Use the loaded font family and specified font size
-        button_size = max(46, self.font_size + 20)  # Scale button size with font size
-        return self.get_button_style(button_size)
+        return self.get_button_style(self.button_size)
 
     def get_space_button_style(self):
         """Get the style for the Space button based on current theme"""
-        if self.dark_mode:
-            return """
-                QPushButton {
-                    border: 1px solid #555555;
-                    border-radius: 6px;
-                    background-color: #444444;
-                    color: #ffffff;
-                    padding: 2px;
-                    text-align: center;
-                }
-                QPushButton:hover {
-                    background-color: #4d4d4d;
-                    border: 1px solid #6699cc;
-                }
-                QPushButton:pressed {
-                    background-color: #555555;
-                    border: 2px solid #6699cc;
-                }
-            """
-        else:
-            return """
-                QPushButton {
-                    border: 1px solid #aaaaaa;
-                    border-radius: 6px;
-                    background-color: #f0f0f0;
-                    color: #000000;
-                    padding: 2px;
-                    text-align: center;
-                }
-                QPushButton:hover {
-                    background-color: #e6f0ff;
-                    border: 1px solid #4d94ff;
-                }
-                QPushButton:pressed {
-                    background-color: #99c2ff;
-                    border: 2px solid #0066ff;
-                }
-            """
+        return _DARK_SPACE_CSS if self.dark_mode else _LIGHT_SPACE_CSS
 
     def get_backspace_button_style(self):
         """Get the style for the Backspace button based on current theme"""
-        if self.dark_mode:
-            return """
-                QPushButton {
-                    border: 1px solid #555555;
-                    border-radius: 6px;
-                    background-color: #444444;
-                    color: #ffffff;
-                    padding: 2px;
-                    text-align: center;
-                }
-                QPushButton:hover {
-                    background-color: #663333;
-                    border: 1px solid #cc6666;
-                }
-                QPushButton:pressed {
-                    background-color: #804040;
-                    border: 2px solid #cc6666;
-                }
-            """
-        else:
-            return """
-                QPushButton {
-                    border: 1px solid #aaaaaa;
-                    border-radius: 6px;
-                    background-color: #f0f0f0;
-                    color: #000000;
-                    padding: 2px;
-                    text-align: center;
-                }
-                QPushButton:hover {
-                    background-color: #ffe6e6;
-                    border: 1px solid #ff4d4d;
-                }
-                QPushButton:pressed {
-                    background-color: #ffb3b3;
-                    border: 2px solid #ff0000;
-                }
-            """
-
-    def create_button(self, text, button_size):
-        """Create a button with proper font settings to avoid font fallback issues"""
-        try:
-            # Create button with no text initially
-            btn = QPushButton()
-            
-            # Set font directly with better fallback strategy
-            # Use consistent font sizing with the rest of the keyboard
-            adjusted_font_size = max(
-                MIN_KB_FONT,
-                min(self.font_size, int(button_size * 0.9))
-            )
-            
-            # Create font using the font manager
-            try:
-                # Get a font from the font manager with the adjusted size
-                font = self.font_manager.get_font(adjusted_font_size)
-                font.setBold(True)
-                
-                # Apply the font to the button
-                btn.setFont(font)
-            except Exception as font_error:
-                logger.error(f"Error setting font for button: {font_error}")
-                # Use a system font as fallback
-                fallback_font = QFont("Arial", 20)
-                btn.setFont(fallback_font)
-            
-            # Set text after font is configured
-            try:
-                btn.setText(text)
-            except Exception as text_error:
-                logger.error(f"Error setting text '{text}' for button: {text_error}")
-                # Try with a simpler text
-                btn.setText("?")
-            
-            # Apply stylesheet for styling (but not font)
-            try:
-                btn.setStyleSheet(self.get_button_style(button_size))
-                
-                # Set minimal size for better responsiveness
-                min_button_size = max(5, int(self.font_size * 0.5))
-                btn.setMinimumSize(min_button_size, min_button_size)
-                
-                # Set size policy to allow the button to grow and shrink with the layout
-                btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            except Exception as style_error:
-                print(f"Error applying style to button: {style_error}")
-                # Apply minimal styling with smaller size for responsiveness
-                min_button_size = max(5, int(self.font_size * 0.5))
-                btn.setMinimumSize(min_button_size, min_button_size)
-                btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            
-            # Print debug info for the first few buttons
-            if text in ['අ', 'ආ', 'ඇ']:
-                print(f"Created button with text: '{text}', font: {btn.font().family()}, size: {adjusted_font_size}")
-            
-            return btn
-        except Exception as e:
-            print(f"Error creating button with text '{text}': {e}")
-            # Create a fallback button with minimal styling and a system font
-            try:
-                fallback_btn = QPushButton("?")  # Use ? as fallback text
-                fallback_font = QFont("Arial", 12)
-                fallback_btn.setFont(fallback_font)
-                min_button_size = max(5, int(self.font_size * 0.5))
-                fallback_btn.setMinimumSize(min_button_size, min_button_size)
-                fallback_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                return fallback_btn
-            except Exception as fallback_error:
-                print(f"Error creating fallback button: {fallback_error}")
-                # Last resort - create an empty button
-                empty_btn = QPushButton()
-                min_button_size = max(5, int(self.font_size * 0.5))
-                empty_btn.setMinimumSize(min_button_size, min_button_size)
-                empty_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                return empty_btn
+        return _DARK_BACKSPACE_CSS if self.dark_mode else _LIGHT_BACKSPACE_CSS
+
+    def _make_key_button(self, key, font):
+        """Create an expanding key button; styling comes from the keyboard stylesheet"""
+        btn = QPushButton(key)
+        btn.setFont(font)
+        
+        # Remember the key value for the shared click slot and mark the
+        # button for the key rules in the keyboard stylesheet
+        btn.setProperty("keyValue", key)
+        btn.setProperty("role", "key")
+        
+        # A tiny explicit minimum overrides the text-based size hint so keys can
+        # shrink; the real minimum key size is set on the grid (_set_grid_minimum)
+        btn.setMinimumSize(1, 1)
+        btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        return btn
+
+    def _make_wide_button(self, text, name, font, slot):
+        """Create a Space/Backspace style button styled by its object name"""
+        btn = QPushButton(text)
+        btn.setObjectName(name)
+        btn.setFont(font)
+        
+        # Height comes from the grid rows; width keeps the text-based hint
+        btn.setMinimumHeight(1)
+        btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        btn.clicked.connect(slot)
+        return btn
+
+    def _set_grid_minimum(self, size):
+        """Set the minimum width and height of every key column and row"""
+        if size == self._grid_min_size:
+            return
+        self._grid_min_size = size
+        for col in range(15):
+            self.grid_layout.setColumnMinimumWidth(col, size)
+        for row in range(5):
+            self.grid_layout.setRowMinimumHeight(row, size)
         
     def create_keyboard(self):
         # Create main layout with minimal margins
@@ -818,143 +1060,71 @@ class SinhalaKeyboard(QFrame):
         
         # Make the grid layout stretch to fill available space
         # Set stretch factors for all columns and rows
+        set_column_stretch = self.grid_layout.setColumnStretch
+        set_row_stretch = self.grid_layout.setRowStretch
         for i in range(15):  # 15 columns
-            self.grid_layout.setColumnStretch(i, 1)
+            set_column_stretch(i, 1)
         for i in range(5):   # 5 rows
-            self.grid_layout.setRowStretch(i, 1)
+            set_row_stretch(i, 1)
         
         # Calculate initial button size based on font size and default height
         # This will be adjusted in update_buttons when the keyboard is resized
         button_size = max(40, int(self.font_size * 1.5))
         
-        print(f"Creating keyboard with button size: {button_size}px, font: {self.keyboard_font_family}")
-
-        # Row 0: Vowels
-        vowels = self.keys['vowels']
-        for col, key in enumerate(vowels):
-            # Create button with proper font settings
-            btn = self.create_button(key, button_size)
-            
-            # Print debug info for first button
-            if col == 0:
-                print(f"Created button with text: '{key}', font: {self.keyboard_font_family}, size: {self.font_size}")
-
-            # Only අ has a popup with variants
-            if key == 'අ':
-                btn.clicked.connect(lambda checked=False, k=key, b=btn: self.show_vowel_group(k, b))
-            else:
-                key_fixed = key
-                btn.clicked.connect(lambda checked=False, k=key_fixed, b=btn: self.on_key_clicked(k, b))
-
-            self.grid_layout.addWidget(btn, 0, col)
-
-        # Row 1: Vowel modifiers and first consonants
-        row1_keys = ['ු', 'ූ', 'ෙ', 'ේ', 'ෛ', 'ො', 'ෝ', 'ෞ', 'ක', 'ඛ', 'ග', 'ඝ', 'ඟ', 'ච', 'ඡ']
-        for col, key in enumerate(row1_keys):
-            # Create button with proper font settings
-            btn = self.create_button(key, button_size)
-            
-            key_fixed = key
-            btn.clicked.connect(lambda checked=False, k=key_fixed, b=btn: self.on_key_clicked(k, b))
-            self.grid_layout.addWidget(btn, 1, col)
-
-        # Row 2: More consonants
-        row2_keys = ['ජ', 'ඣ', 'ඤ', 'ඥ', 'ට', 'ඨ', 'ඩ', 'ඪ', 'ණ', 'ඬ', 'ත', 'ථ', 'ද', 'ධ', 'න']
-        for col, key in enumerate(row2_keys):
-            # Create button with proper font settings
-            btn = self.create_button(key, button_size)
-            
-            key_fixed = key
-            btn.clicked.connect(lambda checked=False, k=key_fixed, b=btn: self.on_key_clicked(k, b))
-            self.grid_layout.addWidget(btn, 2, col)
-
-        # Row 3: More consonants
-        row3_keys = ['ඳ', 'ප', 'ඵ', 'බ', 'භ', 'ම', 'ඹ', 'ය', 'ර', 'ල', 'ව', 'ශ', 'ෂ', 'ස', 'හ']
-        for col, key in enumerate(row3_keys):
-            # Create button with proper font settings
-            btn = self.create_button(key, button_size)
-            
-            key_fixed = key
-            btn.clicked.connect(lambda checked=False, k=key_fixed, b=btn: self.on_key_clicked(k, b))
-            self.grid_layout.addWidget(btn, 3, col)
-
-        # Row 4: Remaining consonants and special characters
-        row4_keys = ['ළ', 'ෆ', 'ං', 'ඃ', '්', 'ා', 'ැ', 'ෑ', 'ි', 'ී']
-        for col, key in enumerate(row4_keys):
-            # Create button with proper font settings
-            btn = self.create_button(key, button_size)
-            
-            key_fixed = key
-            btn.clicked.connect(lambda checked=False, k=key_fixed, b=btn: self.on_key_clicked(k, b))
-            self.grid_layout.addWidget(btn, 4, col)
-
-        try:
-            # Add Space button with proper font settings
-            space_btn = QPushButton("Space")
-            
-            # Use a system font for Latin text buttons to avoid rendering issues
-            # These buttons don't need Sinhala font support
-            font = QFont("Arial", int(button_size * 0.4))
-            font.setBold(True)
-            space_btn.setFont(font)
-            space_btn.setStyleSheet(self.get_space_button_style())
-            
-            # Set minimal button size for better responsiveness
-            min_button_size = max(5, int(self.font_size * 0.5))
-            space_btn.setMinimumHeight(min_button_size)
-            space_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            space_btn.clicked.connect(lambda checked=False, b=space_btn: self.on_key_clicked("Space", b))
-
-            # Add Space button to span 3 columns
-            self.grid_layout.addWidget(space_btn, 4, 10, 1, 3)
-
-            # Add Backspace button with proper font settings
-            backspace_btn = QPushButton("Backspace")
-            backspace_btn.setFont(font)  # Reuse the same font
-            backspace_btn.setStyleSheet(self.get_backspace_button_style())
-            backspace_btn.setMinimumHeight(min_button_size)
-            backspace_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            backspace_btn.clicked.connect(lambda checked=False, b=backspace_btn: self.on_key_clicked("Backspace", b))
-            
-            # Print debug info
-            print(f"Created Space/Backspace buttons with font: {font.family()}")
-        except Exception as e:
-            print(f"Error creating Space/Backspace buttons: {e}")
-            # Create fallback buttons with system font
-            space_btn = QPushButton("Space")
-            fallback_font = QFont("Arial", 12)
-            space_btn.setFont(fallback_font)
-            min_button_size = max(5, int(self.font_size * 0.5))
-            space_btn.setMinimumHeight(min_button_size)
-            space_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            space_btn.clicked.connect(lambda checked=False, b=space_btn: self.on_key_clicked("Space", b))
-            self.grid_layout.addWidget(space_btn, 4, 10, 1, 3)
-            
-            backspace_btn = QPushButton("Backspace")
-            backspace_btn.setFont(fallback_font)
-            backspace_btn.setMinimumHeight(min_button_size)
-            backspace_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            backspace_btn.clicked.connect(lambda checked=False, b=backspace_btn: self.on_key_clicked("Backspace", b))
-
-        # Add Backspace button to span 2 columns
-        self.grid_layout.addWidget(backspace_btn, 4, 13, 1, 2)
+        if _DEBUG:
+            logger.debug("Creating keyboard with button size: %dpx, font: %s", button_size, self.keyboard_font_family)
+
+        # One bold key font shared by every button, Space and Backspace included
+        font = self._get_button_font(self.font_size)
+        self._applied_button_font = font
+        min_button_size = max(5, int(self.font_size * 0.5))
+
+        # Standard keys report clicks through one button group; the id of each
+        # key is its index in _key_by_id
+        key_group = QButtonGroup(self)
+        key_group.setExclusive(False)
+        self._key_by_id = []
+
+        # Local bindings keep attribute lookups out of the construction loop
+        make_button = self._make_key_button
+        add_widget = self.grid_layout.addWidget
+        add_to_group = key_group.addButton
+        key_by_id = self._key_by_id
+        on_group_pressed = self._on_vowel_group_pressed
+        on_group_released = self._on_vowel_group_released
+        on_group_clicked = self._on_vowel_group_clicked
+        vowel_groups = self.vowel_groups
+        append_button = self._standard_buttons.append
+
+        for row, keys in self.rows:
+            for col, key in enumerate(keys):
+                btn = make_button(key, font)
+                if key in vowel_groups:
+                    # Keys with variants (අ) type on a tap and open the popup on a long press
+                    btn.pressed.connect(on_group_pressed)
+                    btn.released.connect(on_group_released)
+                    btn.clicked.connect(on_group_clicked)
+                else:
+                    add_to_group(btn, len(key_by_id))
+                    key_by_id.append(key)
+                add_widget(btn, row, col)
+                append_button(btn)
+
+        # Space spans 3 columns and Backspace 2 at the end of row 4
+        self._space_btn = self._make_wide_button("Space", "space", font, self._on_space)
+        add_widget(self._space_btn, 4, 10, 1, 3)
+        self._backspace_btn = self._make_wide_button("Backspace", "backspace", font, self._on_backspace)
+        add_widget(self._backspace_btn, 4, 13, 1, 2)
+        self._set_grid_minimum(min_button_size)
+        key_group.idClicked.connect(self._on_key_id_clicked)
+        self._key_group = key_group
 
         main_layout.addLayout(self.grid_layout, 1)  # Add with stretch factor of 1
         
         # Add resize handle indicator at the bottom
         resize_hint = QLabel("▲ Drag edges to resize ▼")
         resize_hint.setAlignment(Qt.AlignCenter)
-        resize_hint.setStyleSheet("""
-            QLabel {
-                color: #666666;
-                font-size: 11px;
-                font-weight: bold;
-                padding: 2px;
-                background-color: transparent;
-                border-top: 1px dotted #aaaaaa;
-                border-bottom: 1px dotted #aaaaaa;
-            }
-        """)
+        resize_hint.setStyleSheet(_RESIZE_HINT_CSS)
         main_layout.addWidget(resize_hint, 0)  # Add with stretch factor of 0
 
         # Set size policy to make the keyboard fit within the window but allow vertical resizing
@@ -964,484 +1134,366 @@ class SinhalaKeyboard(QFrame):
         # This ensures the layout exists when update_buttons is called
         self.update_buttons()
 
+        # Build the shared variant popup and its button pool in the first idle
+        # slice so the first long press or consonant tap doesn't pay for it
+        QTimer.singleShot(0, self._prebuild_variant_popup)
+
+    @Slot(int)
+    def _on_key_id_clicked(self, key_id):
+        """Dispatch a click from any standard key button in the key group"""
+        self.on_key_clicked(self._key_by_id[key_id], self._key_group.button(key_id))
+
+    @Slot()
+    def _on_vowel_group_pressed(self):
+        """Start timing a press on a key that has a vowel variant popup"""
+        self._long_press_button = self.sender()
+        self._long_press_timer.start(KB_LONG_PRESS_MS)
+
+    @Slot()
+    def _on_vowel_group_released(self):
+        """Cancel the pending popup when the key is released early"""
+        self._long_press_timer.stop()
+
+    @Slot()
+    def _on_vowel_group_clicked(self):
+        """Type the key itself on a short press"""
+        btn = self.sender()
+        self._emit_key(btn.property("keyValue") or btn.text())
+
+    @Slot()
+    def _open_vowel_popup(self):
+        """Show the vowel variant popup once the key has been held long enough"""
+        btn = self._long_press_button
+        if btn is None:
+            return
+        # Release the key now: the popup takes over the mouse, and a key that is
+        # no longer down doesn't emit clicked, so the press types nothing
+        btn.setDown(False)
+        # Deliver pending Backspaces before the popup can type its choice
+        if self._pending_backspaces:
+            self._flush_backspaces()
+        self.show_vowel_group(btn.property("keyValue") or btn.text(), btn)
+
+    @Slot()
+    def _on_space(self):
+        """Handle the Space button"""
+        self.on_key_clicked("Space", self.sender())
+
+    @Slot()
+    def _on_backspace(self):
+        """Handle the Backspace button"""
+        if self.debounce_ms > 0:
+            # Count the press and restart the window; flushed once presses pause
+            self._pending_backspaces += 1
+            self._backspace_timer.start(self.debounce_ms)
+            return
+        self.on_key_clicked("Backspace", self.sender())
+
+    @Slot()
+    def _flush_backspaces(self):
+        """Deliver the Backspace presses collected during the debounce window"""
+        self._backspace_timer.stop()
+        count = self._pending_backspaces
+        self._pending_backspaces = 0
+        if count:
+            self.backspacePressed.emit(count)
+
+    def _emit_key(self, key):
+        """Emit keyPressed for a key"""
+        # Backspaces pressed before this key must reach the editor first
+        if self._pending_backspaces:
+            self._flush_backspaces()
+        self.keyPressed.emit(key)
+
+    @Slot(str, QPushButton)
     def on_key_clicked(self, key, button):
         """Handle key clicks with visual feedback"""
         try:
             # Check if the key is a consonant that can have vowel modifiers
-            if key in self.consonants:
+            if key in self._consonants_set:
+                # Deliver pending Backspaces before the popup can type its choice
+                if self._pending_backspaces:
+                    self._flush_backspaces()
                 # Show vowel modifier options
                 self.show_vowel_modifiers(key)
-            elif key in self.keys.get('modifiers', []):
+            elif key in self._modifiers_set:
                 # For modifiers, we'll just emit them directly
                 # In a real implementation, you might want to combine with the last consonant
-                self.keyPressed.emit(key)
+                self._emit_key(key)
             else:
                 # For non-consonants, just emit the key press signal
-                self.keyPressed.emit(key)
+                self._emit_key(key)
         except Exception as e:
-            print(f"Error in on_key_clicked for key '{key}': {e}")
+            logger.error(f"Error in on_key_clicked for key '{key}': {e}")
             # In case of error, just emit the key directly
-            self.keyPressed.emit(key)
+            self._emit_key(key)
 
     def show_vowel_group(self, vowel, button):
         """Show a popup with vowel variants"""
         try:
             if vowel not in self.vowel_groups:
                 # If no group defined, just emit the key
-                self.keyPressed.emit(vowel)
+                self._emit_key(vowel)
                 return
-    
-            # Calculate current button size based on keyboard height
-            height_factor = self.height() / self.default_height
-            current_button_size = max(46, int((self.font_size + 20) * height_factor))
-    
-            # Create a dialog to show vowel variants
-            dialog = QDialog(self.parent())
-            dialog.setWindowTitle(f"Vowel Variants")
-            dialog.setModal(False)  # Make it non-modal
+
+            dialog = self._populate_popup(f"Variants of {vowel}", self.vowel_groups[vowel], 250)
         except Exception as e:
-            print(f"Error initializing vowel group dialog: {e}")
+            logger.error(f"Error initializing vowel group dialog: {e}")
             # Just emit the vowel without showing the dialog
-            self.keyPressed.emit(vowel)
+            self._emit_key(vowel)
             return
 
-        # Enable closing when clicking outside the dialog
-        dialog.setAttribute(Qt.WA_DeleteOnClose)
-
-        # Install event filter to detect clicks outside
-        class ClickOutsideFilter(QObject):
-            def eventFilter(self, obj, event):
-                if event.type() == QEvent.Type.MouseButtonPress:
-                    # Check if the click is outside the dialog
-                    # Use event.globalPosition().toPoint() instead of deprecated globalPos()
-                    global_pos = event.globalPosition().toPoint() if hasattr(event, 'globalPosition') else event.globalPos()
-                    if not dialog.geometry().contains(global_pos):
-                        dialog.close()
-                        return True
-                return False
-
-        # Create and install the filter
-        click_filter = ClickOutsideFilter()
-        if self.parent():
-            self.parent().installEventFilter(click_filter)
-            # Connect dialog's finished signal to remove the event filter
-            dialog.finished.connect(lambda: self.parent().removeEventFilter(click_filter))
-
-        # Apply theme-specific styling
-        if self.dark_mode:
-            dialog.setStyleSheet("""
-                QDialog {
-                    background-color: #333333;
-                    border: 1px solid #555555;
-                    border-radius: 10px;
-                }
-            """)
-        else:
-            dialog.setStyleSheet("""
-                QDialog {
-                    background-color: #f5f5f5;
-                    border: 1px solid #cccccc;
-                    border-radius: 10px;
-                }
-            """)
-
-        # Create layout for the dialog
-        layout = QVBoxLayout()
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(5)
-
-        # Add a label
-        label = QLabel(f"Select a variant of {vowel}:")
-        label.setAlignment(Qt.AlignCenter)
-        
-        # Calculate font size based on current keyboard size
-        adjusted_font_size = max(self.font_size - 8, int((self.font_size - 8) * height_factor))
-        
-        # Set style with font size
-        if self.dark_mode:
-            label.setStyleSheet(f"color: #ffffff; font-size: {adjusted_font_size}px;")
-        else:
-            label.setStyleSheet(f"color: #000000; font-size: {adjusted_font_size}px;")
-        layout.addWidget(label)
-
-        # Create a grid for the vowel variants
-        grid = QGridLayout()
-        grid.setSpacing(5)
-
-        # Add buttons for each variant
-        variants = self.vowel_groups[vowel]
-        
-        # Create font with better fallback strategy
-        adjusted_font_size = max(self.font_size - 4, 12)
-        font = QFont(self.keyboard_font_family, adjusted_font_size)
-        # Use PreferMatch instead of NoFontMerging to allow some fallback
-        font.setStyleStrategy(QFont.StyleStrategy.PreferMatch)
-        font.setBold(True)
-        
-        for i, variant in enumerate(variants):
-            btn = QPushButton(variant)
-            
-            # Use the same button size as the main keyboard
-            btn.setFixedSize(current_button_size, current_button_size)
-            
-            # Set font directly with better fallback strategy
-            btn.setFont(font)
-            
-            # Apply theme-specific styling (without font settings)
-            if self.dark_mode:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3c3c3c;
-                        color: #ffffff;
-                        border: 1px solid #555555;
-                        border-radius: 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #4d4d4d;
-                        border: 1px solid #6699cc;
-                    }
-                    QPushButton:pressed {
-                        background-color: #555555;
-                        border: 2px solid #6699cc;
-                    }
-                """)
-            else:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ffffff;
-                        color: #000000;
-                        border: 1px solid #aaaaaa;
-                        border-radius: 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e6f0ff;
-                        border: 1px solid #4d94ff;
-                    }
-                    QPushButton:pressed {
-                        background-color: #99c2ff;
-                        border: 2px solid #0066ff;
-                    }
-                """)
-
-            # Use a closure to capture the current value
-            variant_fixed = variant  # Create a fixed reference
-            btn.clicked.connect(lambda checked=False, v=variant_fixed: self.select_vowel_variant(dialog, v))
-            grid.addWidget(btn, 0, i)
-
-        layout.addLayout(grid)
-
-        # Set dialog properties
-        dialog.setLayout(layout)
-        dialog.setMinimumWidth(250)
-        dialog.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)  # Removed Qt.Popup flag
-
         try:
-            # Position the dialog near the button
+            # Position the dialog just above the button
             button_pos = button.mapToGlobal(button.rect().topLeft())
-            dialog.move(button_pos.x(), button_pos.y() - 80)
-            
-            # Make sure the dialog is visible on the current screen
-            screen = self.screen()
-            if screen:
-                screen_geometry = screen.geometry()
-                dialog_geometry = dialog.geometry()
-                
-                # Adjust if the dialog is outside the screen
-                if not screen_geometry.contains(dialog_geometry):
-                    # If outside screen, reposition to be visible
-                    if dialog_geometry.right() > screen_geometry.right():
-                        dialog.move(screen_geometry.right() - dialog_geometry.width(), dialog_geometry.y())
-                    if dialog_geometry.bottom() > screen_geometry.bottom():
-                        dialog.move(dialog_geometry.x(), screen_geometry.bottom() - dialog_geometry.height())
-                    if dialog_geometry.left() < screen_geometry.left():
-                        dialog.move(screen_geometry.left(), dialog_geometry.y())
-                    if dialog_geometry.top() < screen_geometry.top():
-                        dialog.move(dialog_geometry.x(), screen_geometry.top())
-            else:
-                # If we can't get screen info, just center the dialog on the keyboard
-                keyboard_center = self.mapToGlobal(self.rect().center())
-                dialog.move(keyboard_center.x() - dialog.width() // 2, keyboard_center.y() - dialog.height() // 2)
+            self._place_popup(dialog, button_pos.x(), button_pos.y() - 80)
                 
             # Show the dialog
-            dialog.exec_()
+            self._show_popup(dialog)
         except Exception as e:
-            print(f"Error showing vowel group dialog: {e}")
+            logger.error(f"Error showing vowel group dialog: {e}")
             # Just emit the vowel without showing the dialog
-            self.keyPressed.emit(vowel)
-
-    def select_vowel_variant(self, dialog, vowel):
-        """Handle selection of a vowel variant"""
-        # Close the dialog
-        dialog.accept()
+            self._emit_key(vowel)
 
-        # Emit the key press signal with the selected vowel
-        self.keyPressed.emit(vowel)
+    @Slot()
+    def _on_popup_key(self):
+        """Close the popup and type the variant on the clicked button"""
+        # The pooled popup has no result to report, so hiding it is enough
+        self._variant_popup.hide()
+        # Popup buttons show exactly the text they type
+        self._emit_key(self.sender().text())
 
     def show_vowel_modifiers(self, consonant):
         """Show a dialog with vowel modifier options for the selected consonant"""
         try:
-            # Calculate current button size based on keyboard height
-            height_factor = self.height() / self.default_height
-            current_button_size = max(46, int((self.font_size + 20) * height_factor))
-            
-            # Create a dialog to show vowel modifiers
-            dialog = QDialog(self.parent())
-            dialog.setWindowTitle(f"Vowel Modifiers for {consonant}")
-            dialog.setModal(False)  # Changed to non-modal so it can be closed by clicking outside
+            # Base letter followed by its modifier combinations
+            dialog = self._populate_popup(f"Vowel Modifiers for {consonant}",
+                                          self.modifier_combinations(consonant), 300)
         except Exception as e:
-            print(f"Error initializing vowel modifiers dialog: {e}")
+            logger.error(f"Error initializing vowel modifiers dialog: {e}")
             # Just emit the consonant without showing the dialog
-            self.keyPressed.emit(consonant)
+            self._emit_key(consonant)
             return
 
-        # Enable closing when clicking outside the dialog
-        dialog.setAttribute(Qt.WA_DeleteOnClose)
-
-        # Install event filter to detect clicks outside
-        class ClickOutsideFilter(QObject):
-            def eventFilter(self, obj, event):
-                if event.type() == QEvent.Type.MouseButtonPress:
-                    # Check if the click is outside the dialog
-                    # Use event.globalPosition().toPoint() instead of deprecated globalPos()
-                    global_pos = event.globalPosition().toPoint() if hasattr(event, 'globalPosition') else event.globalPos()
-                    if not dialog.geometry().contains(global_pos):
-                        dialog.close()
-                        return True
-                return False
-
-        # Create and install the filter
-        click_filter = ClickOutsideFilter()
-        if self.parent():
-            self.parent().installEventFilter(click_filter)
-            # Connect dialog's finished signal to remove the event filter
-            dialog.finished.connect(lambda: self.parent().removeEventFilter(click_filter))
-
-        # Apply theme-specific styling
-        if self.dark_mode:
-            dialog.setStyleSheet("""
-                QDialog {
-                    background-color: #333333;
-                    border: 1px solid #555555;
-                    border-radius: 10px;
-                }
-            """)
-        else:
-            dialog.setStyleSheet("""
-                QDialog {
-                    background-color: #f5f5f5;
-                    border: 1px solid #cccccc;
-                    border-radius: 10px;
-                }
-            """)
-
-        # Create layout for the dialog
-        layout = QVBoxLayout()
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(5)
-
-        # Add a label
-        label = QLabel(f"Select a vowel modifier for {consonant}:")
-        label.setAlignment(Qt.AlignCenter)
-        
-        # Calculate font size based on current keyboard size
-        adjusted_font_size = max(self.font_size - 8, int((self.font_size - 8) * height_factor))
-        
-        # Set style with font size
-        if self.dark_mode:
-            label.setStyleSheet(f"color: #ffffff; font-size: {adjusted_font_size}px;")
-        else:
-            label.setStyleSheet(f"color: #000000; font-size: {adjusted_font_size}px;")
-        layout.addWidget(label)
-
-        # Create a grid for the vowel modifiers
-        grid = QGridLayout()
-        grid.setSpacing(5)
-
-        # Get valid modifiers for this consonant
-        valid_modifiers = self.valid_modifiers.get(consonant, self.valid_modifiers['DEFAULT'])
-
-        # Add buttons for each modifier
-        # First add the base consonant (no modifier)
-        btn = QPushButton(consonant)
-        
-        # Use the same button size as the main keyboard
-        btn.setFixedSize(current_button_size, current_button_size)
-        
-        # Set font directly with better fallback strategy
-        adjusted_font_size = max(self.font_size - 4, 12)
-        font = QFont(self.keyboard_font_family, adjusted_font_size)
-        # Use PreferMatch instead of NoFontMerging to allow some fallback
-        font.setStyleStrategy(QFont.StyleStrategy.PreferMatch)
-        font.setBold(True)
-        btn.setFont(font)
-        
-        # Apply theme-specific styling (without font settings)
-        if self.dark_mode:
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3c3c3c;
-                    color: #ffffff;
-                    border: 1px solid #555555;
-                    border-radius: 8px;
-                }
-                QPushButton:hover {
-                    background-color: #4d4d4d;
-                    border: 1px solid #6699cc;
-                }
-                QPushButton:pressed {
-                    background-color: #555555;
-                    border: 2px solid #6699cc;
-                }
-            """)
-        else:
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #ffffff;
-                    color: #000000;
-                    border: 1px solid #aaaaaa;
-                    border-radius: 8px;
-                }
-                QPushButton:hover {
-                    background-color: #e6f0ff;
-                    border: 1px solid #4d94ff;
-                }
-                QPushButton:pressed {
-                    background-color: #99c2ff;
-                    border: 2px solid #0066ff;
-                }
-            """)
-
-        # Use a closure to capture the current value
-        btn.clicked.connect(lambda checked=False, c=consonant: self.select_consonant_with_modifier(dialog, c, ''))
-        grid.addWidget(btn, 0, 0)
-
-        # Add buttons for each modifier
-        col = 1
-        row = 0
-        for modifier in valid_modifiers:
-            # Skip empty modifier as we already added it
-            if modifier == '':
-                continue
-                
-            # Create a combined character (consonant + modifier)
-            combined = consonant + modifier
-            
-            btn = QPushButton(combined)
-            
-            # Use the same button size as the main keyboard and other buttons in this dialog
-            btn.setFixedSize(current_button_size, current_button_size)
-            
-            # Set font directly with better fallback strategy
-            # Reuse the same font as the base consonant button
-            btn.setFont(font)
-            
-            # Apply theme-specific styling (without font settings)
-            if self.dark_mode:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3c3c3c;
-                        color: #ffffff;
-                        border: 1px solid #555555;
-                        border-radius: 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #4d4d4d;
-                        border: 1px solid #6699cc;
-                    }
-                    QPushButton:pressed {
-                        background-color: #555555;
-                        border: 2px solid #6699cc;
-                    }
-                """)
-            else:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ffffff;
-                        color: #000000;
-                        border: 1px solid #aaaaaa;
-                        border-radius: 8px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e6f0ff;
-                        border: 1px solid #4d94ff;
-                    }
-                    QPushButton:pressed {
-                        background-color: #99c2ff;
-                        border: 2px solid #0066ff;
-                    }
-                """)
-
-            # Use a closure to capture the current values
-            modifier_fixed = modifier  # Create a fixed reference
-            btn.clicked.connect(lambda checked=False, c=consonant, m=modifier_fixed: self.select_consonant_with_modifier(dialog, c, m))
-            
-            # Add to grid, wrapping to next row after 5 columns
-            grid.addWidget(btn, row, col)
-            col += 1
-            if col > 4:  # 5 columns (0-4)
-                col = 0
-                row += 1
-
-        layout.addLayout(grid)
-
-        # Set dialog properties
-        dialog.setLayout(layout)
-        dialog.setMinimumWidth(300)
-        dialog.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)  # Removed Qt.Popup flag
-
         try:
             # Position the dialog near the cursor
             cursor_pos = QCursor.pos()
-            dialog.move(cursor_pos.x() - 150, cursor_pos.y() - 150)
-            
-            # If we can't get cursor position, try to position relative to the keyboard
             if cursor_pos.isNull():
+                # If we can't get cursor position, position relative to the keyboard
                 keyboard_pos = self.mapToGlobal(self.rect().topLeft())
-                dialog.move(keyboard_pos.x() + 100, keyboard_pos.y() - 200)
-                
-            # Make sure the dialog is visible on the current screen
-            screen = self.screen()
-            if screen:
-                screen_geometry = screen.geometry()
-                dialog_geometry = dialog.geometry()
-                
-                # Adjust if the dialog is outside the screen
-                if not screen_geometry.contains(dialog_geometry):
-                    # If outside screen, reposition to be visible
-                    if dialog_geometry.right() > screen_geometry.right():
-                        dialog.move(screen_geometry.right() - dialog_geometry.width(), dialog_geometry.y())
-                    if dialog_geometry.bottom() > screen_geometry.bottom():
-                        dialog.move(dialog_geometry.x(), screen_geometry.bottom() - dialog_geometry.height())
-                    if dialog_geometry.left() < screen_geometry.left():
-                        dialog.move(screen_geometry.left(), dialog_geometry.y())
-                    if dialog_geometry.top() < screen_geometry.top():
-                        dialog.move(dialog_geometry.x(), screen_geometry.top())
+                self._place_popup(dialog, keyboard_pos.x() + 100, keyboard_pos.y() - 200)
             else:
-                # If we can't get screen info, just center the dialog on the keyboard
-                keyboard_center = self.mapToGlobal(self.rect().center())
-                dialog.move(keyboard_center.x() - dialog.width() // 2, keyboard_center.y() - dialog.height() // 2)
+                self._place_popup(dialog, cursor_pos.x() - 150, cursor_pos.y() - 150)
                 
             # Show the dialog
-            dialog.exec_()
+            self._show_popup(dialog)
         except Exception as e:
-            print(f"Error showing vowel modifiers dialog: {e}")
+            logger.error(f"Error showing vowel modifiers dialog: {e}")
             # Just emit the consonant without showing the dialog
-            self.keyPressed.emit(consonant)
+            self._emit_key(consonant)
+
+    # --- Variant popup ---
+
+    def _ensure_variant_popup(self):
+        """Build the shared frameless variant popup once and return it"""
+        if self._variant_popup is not None:
+            return self._variant_popup
+
+        dialog = QDialog(self.parent())
+        dialog.setProperty("theme", "dark" if self.dark_mode else "light")
 
-    def select_consonant_with_modifier(self, dialog, consonant, modifier):
-        """Handle selection of a consonant with a modifier"""
-        # Close the dialog
-        dialog.accept()
+        # One grid is the whole layout; the first button already shows the
+        # base letter, so the popup needs no prompt label
+        grid = QGridLayout(dialog)
+        grid.setContentsMargins(10, 10, 10, 10)
+        grid.setSpacing(5)
+
+        # A native popup closes itself on clicks outside it
+        dialog.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint)
+
+        dialog.popup_grid = grid
+        dialog.popup_buttons = []
+        dialog.popup_metrics = None
+        # The popup belongs to the keyboard's window, so it is torn down with the keyboard
+        self.destroyed.connect(dialog.deleteLater)
+        self._variant_popup = dialog
+        return dialog
+
+    def _populate_popup(self, title, items, min_width):
+        """Show `items` on the pooled popup buttons, wrapping after 5 per row"""
+        dialog = self._ensure_variant_popup()
+        dialog.setWindowTitle(title)
+
+        # Relabel the pool with repaints suspended, so a popup that is already
+        # open repaints once instead of once per button
+        dialog.setUpdatesEnabled(False)
+        try:
+            # Grow the button pool if this popup needs more buttons than any before
+            buttons = self._grow_popup_pool(dialog, len(items))
+            for i, btn in enumerate(buttons):
+                if i < len(items):
+                    btn.setText(items[i])
+                    btn.show()
+                else:
+                    btn.hide()
+        finally:
+            dialog.setUpdatesEnabled(True)
+
+        dialog.setMinimumWidth(min_width)
+        self._refresh_popup(dialog)
+
+        # Re-fit the dialog to the buttons now visible
+        dialog.layout().activate()
+        dialog.adjustSize()
+        return dialog
+
+    def _grow_popup_pool(self, dialog, count):
+        """Make sure the popup has at least `count` pooled buttons and return the pool"""
+        buttons = dialog.popup_buttons
+        while len(buttons) < count:
+            btn = self._make_popup_button(dialog)
+            row, col = divmod(len(buttons), 5)
+            dialog.popup_grid.addWidget(btn, row, col)
+            buttons.append(btn)
+        return buttons
+
+    def _prebuild_variant_popup(self):
+        """Build and style the popup with enough buttons for the largest modifier popup"""
+        dialog = self._ensure_variant_popup()
+        # Base letter plus its longest modifier list
+        largest = 1 + max(len(modifiers) for modifiers in self.valid_modifiers.values())
+        self._grow_popup_pool(dialog, largest)
+        # Parse its stylesheet now rather than when the first popup opens
+        self._refresh_popup(dialog)
+
+    def _make_popup_button(self, dialog):
+        """Create a pooled popup button matching the popup's current size and font"""
+        btn = QPushButton()
+        # No popup button is ever the dialog's default button
+        btn.setAutoDefault(False)
+        btn.setDefault(False)
+        btn.clicked.connect(self._on_popup_key)
+        # Its size comes from the popup stylesheet (see _refresh_popup)
+        if dialog.popup_metrics is not None:
+            btn.setFont(self._get_popup_font(dialog.popup_metrics[1]))
+        return btn
+
+    def _refresh_popup(self, dialog):
+        """Size the popup's buttons to the current keyboard size"""
+        metrics = self._current_popup_metrics()
+        button_size, button_font_size, _ = metrics
+        previous = dialog.popup_metrics
+        if previous == metrics:
+            return
+        dialog.popup_metrics = metrics
+
+        # Theme and button size live in one dialog sheet that all buttons inherit;
+        # it is only re-applied when the size changes
+        if previous is None or previous[0] != button_size:
+            dialog.setStyleSheet(self.get_popup_style(button_size))
+
+        font = self._get_popup_font(button_font_size)
+        for btn in dialog.popup_buttons:
+            btn.setFont(font)
+
+    def _current_popup_metrics(self):
+        """Return the popup (button size, font size, font family), recomputed only after a resize or font change"""
+        metrics = self._popup_metrics
+        if metrics is None or metrics[2] != self.keyboard_font_family:
+            # Calculate current button size based on keyboard height
+            height_factor = self.height() / self.default_height
+            button_size = max(46, int((self.font_size + 20) * height_factor))
+            metrics = self._popup_metrics = (button_size, max(self.font_size - 4, 12),
+                                             self.keyboard_font_family)
+        return metrics
+
+    def get_popup_style(self, button_size):
+        """Get the popup dialog stylesheet for the given button size"""
+        style = _POPUP_CSS_CACHE.get(button_size)
+        if style is None:
+            style = _POPUP_DIALOG_CSS + _POPUP_SIZE_CSS_TEMPLATE.format(size=button_size - 2)
+            _POPUP_CSS_CACHE[button_size] = style
+        return style
+
+    def _apply_popup_theme(self):
+        """Switch the pooled popup to the current theme"""
+        dialog = self._variant_popup
+        if dialog is None:
+            return
+        dialog.setProperty("theme", "dark" if self.dark_mode else "light")
+        if dialog.popup_metrics is not None:
+            # Re-applying the sheet re-polishes the dialog and its buttons
+            # against the new property value
+            dialog.setStyleSheet(self.get_popup_style(dialog.popup_metrics[0]))
+
+    def _get_popup_font(self, size):
+        """Return the shared bold popup font, rebuilding it only when the family or size changes"""
+        key = (self.keyboard_font_family, size)
+        if self._popup_font is None or self._popup_font_key != key:
+            # Create font with better fallback strategy
+            font = QFont(self.keyboard_font_family, size)
+            # Use PreferMatch instead of NoFontMerging to allow some fallback
+            font.setStyleStrategy(QFont.StyleStrategy.PreferMatch)
+            font.setBold(True)
+            self._popup_font = font
+            self._popup_font_key = key
+        return self._popup_font
+
+    def _place_popup(self, dialog, x, y):
+        """Move the popup to (x, y), kept on the keyboard's screen, in a single move"""
+        screen_geometry = self._screen_geometry()
+        if screen_geometry is None:
+            # If we can't get screen info, just center the dialog on the keyboard
+            keyboard_center = self.mapToGlobal(self.rect().center())
+            dialog.move(keyboard_center.x() - dialog.width() // 2, keyboard_center.y() - dialog.height() // 2)
+            return
+
+        # The popup has already been fitted to its contents, so its size is final
+        x = max(screen_geometry.left(), min(x, screen_geometry.right() + 1 - dialog.width()))
+        y = max(screen_geometry.top(), min(y, screen_geometry.bottom() + 1 - dialog.height()))
+        dialog.move(x, y)
 
-        # Emit the key press signal with the selected consonant + modifier
-        combined = consonant + modifier
-        self.keyPressed.emit(combined)
+    def _screen_geometry(self):
+        """Get the geometry of the keyboard's screen, or None if it has none"""
+        if self._screen_geom is None:
+            # Drop the cache when the keyboard's window moves to another screen
+            window = self.window().windowHandle()
+            if window is not None and window is not self._watched_window:
+                window.screenChanged.connect(self._on_screen_changed)
+                self._watched_window = window
 
+            screen = self.screen()
+            if screen is None:
+                return None
+            if screen is not self._watched_screen:
+                if self._watched_screen is not None:
+                    self._watched_screen.geometryChanged.disconnect(self._on_screen_geometry_changed)
+                screen.geometryChanged.connect(self._on_screen_geometry_changed)
+                self._watched_screen = screen
+            self._screen_geom = screen.geometry()
+        return self._screen_geom
+
+    @Slot(QRect)
+    def _on_screen_geometry_changed(self, geometry):
+        """Keep the cached screen geometry current"""
+        self._screen_geom = geometry
+
+    @Slot(QScreen)
+    def _on_screen_changed(self, screen):
+        """Look the screen geometry up again on the next popup"""
+        self._screen_geom = None
+
+    def _show_popup(self, dialog):
+        """Show a popup without blocking; it closes itself on clicks outside it"""
+        dialog.show()
+        dialog.raise_()
+
+    @Slot(str)
     def on_keyboard_button_clicked(self, text):
         """Handle keyboard button clicks"""
         # This method is called when a key is pressed on the keyboard
         # It emits the keyPressed signal with the text of the key
-        self.keyPressed.emit(text)
+        self._emit_key(text)
         
     # --- Resize handling methods ---
     
@@ -1458,17 +1510,26 @@ class SinhalaKeyboard(QFrame):
             # Skip processing if the size hasn't actually changed
             if event.size() == event.oldSize():
                 return
+            
+            # Popup sizes scale with the keyboard height
+            self._popup_metrics = None
                 
             # Simply update the buttons to match the new size
             # The QSplitter will handle the layout automatically
-            self.update_buttons()
+            if self.resize_in_progress:
+                # Edge drags resize on every mouse move; batch them so the
+                # buttons update at most once per frame
+                if not self._drag_update_timer.isActive():
+                    self._drag_update_timer.start()
+            else:
+                self.update_buttons()
             
             # Emit signal with new height for any components that need to know
             current_height = self.height()
             self.keyboardResized.emit(current_height)
                 
         except Exception as e:
-            print(f"Error in resizeEvent: {e}")
+            logger.error(f"Error in resizeEvent: {e}")
             
     def mousePressEvent(self, event):
         """Handle mouse press events for resizing"""
@@ -1528,7 +1589,7 @@ class SinhalaKeyboard(QFrame):
                 # Find the main window to set resize state
                 self._set_main_window_resize_state(ResizeState.USER)
         except Exception as e:
-            print(f"Error in mousePressEvent: {e}")
+            logger.error(f"Error in mousePressEvent: {e}")
             
     def _reset_resize_state(self):
         """Reset all resize-related state variables to prevent issues"""
@@ -1537,6 +1598,7 @@ class SinhalaKeyboard(QFrame):
         self.initial_mouse_pos = None
         self.initial_height = None
         self._resize_count = 0
+        self._last_drag_height = None
         
         # Reset signal counter if it exists
         if hasattr(self, '_resize_signal_counter'):
@@ -1576,7 +1638,7 @@ class SinhalaKeyboard(QFrame):
                     
                     break
         except Exception as e:
-            print(f"Error setting main window resize state: {e}")
+            logger.error(f"Error setting main window resize state: {e}")
             
     def mouseMoveEvent(self, event):
         """Handle mouse move events for resizing"""
@@ -1585,10 +1647,15 @@ class SinhalaKeyboard(QFrame):
             
             # Show resize cursor when hovering over the resize areas
             if not self.resize_in_progress:
-                if event.position().y() < 10 or event.position().y() > self.height() - 10:
-                    self.setCursor(Qt.SizeVerCursor)
+                y = event.position().y()
+                if y < 10 or y > self.height() - 10:
+                    shape = Qt.SizeVerCursor
                 else:
-                    self.setCursor(Qt.ArrowCursor)
+                    shape = Qt.ArrowCursor
+                # Mouse tracking sends every hover move here; only touch the
+                # cursor when its shape actually changes
+                if self.cursor().shape() != shape:
+                    self.setCursor(shape)
                 return  # Exit early if not resizing
                 
             # Perform resize if in progress
@@ -1618,6 +1685,13 @@ class SinhalaKeyboard(QFrame):
                     # Fallback to a reasonable maximum
                     new_height = min(new_height, 800)
                 
+                # Sub-pixel mouse moves don't change the height in whole pixels
+                new_height = int(new_height)
+                if new_height == self._last_drag_height:
+                    event.accept()
+                    return
+                self._last_drag_height = new_height
+                
                 # Find the main window to set resize state
                 from PySide6.QtWidgets import QApplication
                 app = QApplication.instance()
@@ -1664,7 +1738,8 @@ class SinhalaKeyboard(QFrame):
                         old_block_state = self.blockSignals(True)
                         self.keyboardResized.emit(new_height)
                         self.blockSignals(old_block_state)
-                        logger.debug(f"Emitted resize signal: height={new_height}")
+                        if _DEBUG:
+                            logger.debug("Emitted resize signal: height=%s", new_height)
                 
                 # Accept the event to prevent it from being propagated
                 event.accept()
@@ -1733,6 +1808,7 @@ class SinhalaKeyboard(QFrame):
                                 logger.error(f"Error saving preferences: {save_error}")
                         
                         # Update buttons to match the final size - do this AFTER all other operations
+                        self._drag_update_timer.stop()
                         self.update_buttons()
                         
                         # Emit final resize signal - do this AFTER updating buttons
@@ -1742,7 +1818,7 @@ class SinhalaKeyboard(QFrame):
                         self.blockSignals(old_block_state)
                         
                 except Exception as height_error:
-                    print(f"Error getting final height: {height_error}")
+                    logger.error(f"Error getting final height: {height_error}")
                 
                 # Reset resize state - use a more comprehensive reset
                 self._reset_resize_state()  # Use the dedicated method for consistency
@@ -1761,7 +1837,7 @@ class SinhalaKeyboard(QFrame):
                             widget._kb_resize_state = ResizeState.IDLE
                             break
                 except Exception as e:
-                    print(f"Error resetting main window resize state: {e}")
+                    logger.error(f"Error resetting main window resize state: {e}")
                 
                 # After resize is complete, we want to preserve the current font size
                 # rather than recalculating it based on height
@@ -1775,11 +1851,11 @@ class SinhalaKeyboard(QFrame):
                                 # Update the preferences with our current font size
                                 # This ensures the font size is preserved after manual resize
                                 widget.preferences["keyboard_font_size"] = self.font_size
-                                print(f"Preserved font size {self.font_size} after manual resize")
+                                logger.debug("Preserved font size %s after manual resize", self.font_size)
                                 
                                 # Also update the keyboard height in preferences
                                 widget.preferences["keyboard_height"] = current_height
-                                print(f"Updated keyboard height to {current_height} in preferences")
+                                logger.debug("Updated keyboard height to %s in preferences", current_height)
                                 
                                 # Save preferences immediately
                                 try:
@@ -1806,7 +1882,7 @@ class SinhalaKeyboard(QFrame):
                 
                 # Emit one final resize signal with the final height
                 # This ensures the container is properly updated
-                QTimer.singleShot(300, lambda: self.keyboardResized.emit(current_height))
+                QTimer.singleShot(300, partial(self.keyboardResized.emit, current_height))
                 
                 # Accept the event
                 event.accept()